@@ -1,34 +1,148 @@
 import os
+import io
+import re
+import json
+import asyncio
 import shutil
+import fnmatch
 import tempfile
 import logging
+import logging.handlers
+import queue
 import traceback
+import time
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional, List, Dict, Any
 from fastapi import FastAPI, UploadFile, HTTPException, Form, File
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 from pathlib import Path
-from pxr import Usd, UsdGeom, Sdf, UsdShade, Ar
 from usd_analyzer import EnhancedUsdAnalyzer
 
-# 配置日志
+# 配置日志，可通过环境变量 LOG_LEVEL 调整级别（例如 DEBUG 以获取更多信息）
 logging.basicConfig(
-    level=logging.DEBUG,  # 改为 DEBUG 级别以获取更多信息
+    level=os.environ.get("LOG_LEVEL", "INFO").upper(),
     format='%(asctime)s - %(levelname)s - %(message)s',
     datefmt='%Y-%m-%d %H:%M:%S'
 )
+
+# 日志输出改由后台线程完成，避免请求处理线程（如打包复制线程）被控制台/文件写入阻塞
+_root_logger = logging.getLogger()
+_log_queue = queue.SimpleQueue()
+log_listener = logging.handlers.QueueListener(_log_queue, *_root_logger.handlers, respect_handler_level=True)
+_root_logger.handlers = [logging.handlers.QueueHandler(_log_queue)]
+log_listener.start()
+
 logger = logging.getLogger(__name__)
 
 # 创建临时目录
 TEMP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "temp_uploads")
 os.makedirs(TEMP_DIR, exist_ok=True)
-logger.info(f"Created temp directory at: {TEMP_DIR}")
+logger.info("Created temp directory at: %s", TEMP_DIR)
+
+# 拖拽文件时用于查找原始文件的常见目录
+DRAG_DROP_SEARCH_DIRS = (
+    r"E:\filmserver\test\library\prop\all\main\lookdev\workarea\usd",
+    r"E:\filmserver\test\library\prop",
+    r"E:\filmserver\test\library\env",
+    r"E:\filmserver\test\library",
+    r"E:\filmserver\test",
+    r"E:\filmserver"
+)
+
+# 按路径分析时用于查找文件的常见目录
+PATH_SEARCH_DIRS = (
+    r"E:\filmserver\test\library\prop\all\main\lookdev\workarea\usd",
+    r"E:\filmserver\test\library\prop\all\main\lookdev\publish\v001",
+    r"E:\filmserver\test\library\env\test\aa\lookdev\publish\v001",
+    r"E:\filmserver\test\library\prop",
+    r"E:\filmserver\test\library\env",
+    r"E:\filmserver\test\library",
+    r"E:\filmserver\test",
+    r"E:\filmserver",
+    r"E:\Project\USD_Web_Analysis\backend\temp_uploads"
+)
+
+# 目录存在性检查结果的缓存时间（秒），过期后重新检查以发现新挂载的目录
+COMMON_DIRS_TTL = 60
+
+@lru_cache(maxsize=8)
+def _filter_existing_dirs(dirs, time_bucket):
+    """过滤出存在的目录，结果按时间段缓存"""
+    return tuple(d for d in dirs if os.path.isdir(d))
+
+def get_existing_dirs(dirs):
+    """获取存在的常见目录列表，避免每次请求都检查文件系统"""
+    return _filter_existing_dirs(dirs, int(time.time() // COMMON_DIRS_TTL))
+
+# 支持分析的USD文件扩展名
+USD_EXTENSIONS = frozenset(('.usd', '.usda', '.usdc', '.usdz'))
+
+# 保存上传文件时使用的缓冲区大小（1 MiB），减少小块读写的系统调用次数
+UPLOAD_COPY_BUFFER_SIZE = 1024 * 1024
+
+# 识别UDIM占位符的正则表达式
+UDIM_PLACEHOLDER_RE = re.compile(r'(<UDIM>|<udim>|\.####\.|\.<UDIM>\.|\.<udim>\.)')
+
+# UDIM占位符对应的通配符替换和正则表达式替换，用于查找和验证UDIM序列文件名
+UDIM_PLACEHOLDER_INFO = {
+    "<UDIM>": ("*", r"(\d{4})"),
+    "<udim>": ("*", r"(\d{4})"),
+    ".####.": (".*.", r"\.(\d{4})\."),
+    ".<UDIM>.": (".*.", r"\.(\d{4})\."),
+    ".<udim>.": (".*.", r"\.(\d{4})\."),
+}
+
+# 匹配路径中filmserver之后的部分，例如 E:/filmserver/test/library/prop/main.usda -> test/library/prop/main.usda
+FILMSERVER_RE = re.compile(r'(?:^|.*?[\\/])filmserver[\\/](.+)$', re.IGNORECASE)
+
+# 打包时用于保留目录结构的关键目录名
+REFERENCE_KEY_FOLDERS = ('USD', 'usd', 'assets', 'scenes', 'shots', 'env', 'aa')
+TEXTURE_KEY_FOLDERS = ('texture', 'textures', 'tex', 'maps', 'images', 'txt', 'publish', 'USD', 'usd', 'assets')
+
+# 线程池大小，用于执行阻塞的文件保存和USD分析操作
+EXECUTOR_MAX_WORKERS = 16
+
+# 按路径分析结果的缓存条目数
+ANALYSIS_CACHE_SIZE = 256
+
+# Windows上使用系统的CopyFileExW复制文件，由系统在内核中完成复制（支持时还可利用服务器端复制）
+if os.name == 'nt':
+    import ctypes
+    from ctypes import wintypes
+    _kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    _CopyFileExW = _kernel32.CopyFileExW
+    _CopyFileExW.argtypes = (wintypes.LPCWSTR, wintypes.LPCWSTR, ctypes.c_void_p,
+                             ctypes.c_void_p, ctypes.c_void_p, wintypes.DWORD)
+    _CopyFileExW.restype = wintypes.BOOL
+else:
+    _CopyFileExW = None
+
+# 打包时是否优先使用硬链接代替复制（源和目标位于同一文件系统时几乎不耗时），
+# 通过环境变量 PACK_HARDLINK=1 开启；硬链接与源文件共享内容，需要独立副本时不要开启
+PACK_USE_HARDLINKS = os.environ.get("PACK_HARDLINK", "") == "1"
+
+# 打包时并行复制文件的最大线程数，可通过环境变量 PACK_COPY_THREADS 调整（本地SSD上可设为1）
+# 默认8个线程，足以重叠网络存储（SMB/NFS）上的I/O延迟；值无效时记录警告并使用默认值，不影响服务启动
+try:
+    COPY_MAX_WORKERS = max(1, int(os.environ.get("PACK_COPY_THREADS", 8)))
+except ValueError:
+    logger.warning("Invalid PACK_COPY_THREADS environment variable value, using %s copy thread(s)", 8)
+    COPY_MAX_WORKERS = 8
 
 # 创建增强型USD分析器实例
 enhanced_analyzer = EnhancedUsdAnalyzer()
 
-app = FastAPI()
+# 安装了orjson时使用ORJSONResponse序列化响应，打包/分析结果较大时明显快于标准库json
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:
+    DefaultResponse = JSONResponse
+
+app = FastAPI(default_response_class=DefaultResponse)
 
 # 配置CORS
 app.add_middleware(
@@ -39,6 +153,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def configure_executor():
+    """设置默认线程池，使并发的分析请求可以并行执行"""
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=EXECUTOR_MAX_WORKERS))
+
+@app.on_event("shutdown")
+async def stop_log_listener():
+    """关闭服务时输出队列中剩余的日志"""
+    log_listener.stop()
+
 # API模型定义
 class FileItem(BaseModel):
     name: str
@@ -65,6 +189,58 @@ class PackageRequest(BaseModel):
     textures: List[Dict[str, Any]]
     references: List[Dict[str, Any]]
 
+def _find_by_name(root, target, size=None):
+    """在目录树中递归查找指定文件名的文件，可选地要求文件大小一致"""
+    sub_dirs = []
+    try:
+        with os.scandir(root) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        sub_dirs.append(entry.path)
+                    elif entry.name == target and entry.is_file():
+                        # DirEntry会缓存stat结果，避免重复的系统调用
+                        found_size = entry.stat().st_size
+                        if size is None or found_size == size:
+                            return entry.path
+                        logger.info("File sizes don't match: temp=%s, found=%s", size, found_size)
+                except OSError:
+                    continue
+    except OSError:
+        # 与os.walk一致，忽略无法访问的目录
+        return None
+
+    # 先检查当前目录的文件，再进入子目录（与os.walk的自顶向下顺序一致）
+    for sub_dir in sub_dirs:
+        found_path = _find_by_name(sub_dir, target, size)
+        if found_path:
+            return found_path
+    return None
+
+def _fast_save(upload, path):
+    """将上传的文件保存到磁盘，优先使用sendfile零拷贝，否则使用大缓冲区复制"""
+    src = upload.file
+    with open(path, "wb") as buffer:
+        # 只有当SpooledTemporaryFile已经写入磁盘时才有真正的文件描述符
+        if hasattr(os, "sendfile") and getattr(src, "_rolled", True):
+            try:
+                src_fd = src.fileno()
+                size = os.fstat(src_fd).st_size
+                offset = 0
+                while offset < size:
+                    sent = os.sendfile(buffer.fileno(), src_fd, offset, size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+                return
+            except (OSError, io.UnsupportedOperation, AttributeError) as e:
+                logger.debug("sendfile不可用，回退到缓冲复制: %s", str(e))
+                src.seek(0)
+                buffer.seek(0)
+                buffer.truncate()
+
+        shutil.copyfileobj(src, buffer, UPLOAD_COPY_BUFFER_SIZE)
+
 @app.get("/browse_directory")
 async def browse_directory(directory_path: str = ""):
     """浏览指定目录下的文件和子目录"""
@@ -86,12 +262,12 @@ async def browse_directory(directory_path: str = ""):
                     "current_path": "",
                     "parent_path": None,
                     "items": [
-                        FileItem(
-                            name=drive,
-                            path=drive,
-                            is_directory=True,
-                            size=None
-                        ) for drive in drives
+                        {
+                            "name": drive,
+                            "path": drive,
+                            "is_directory": True,
+                            "size": None
+                        } for drive in drives
                     ]
                 }
             else:
@@ -109,24 +285,24 @@ async def browse_directory(directory_path: str = ""):
         parent_path = os.path.dirname(directory_path) if directory_path != os.path.dirname(directory_path) else None
 
         # 列出目录内容
+        # 使用os.scandir，DirEntry会缓存目录遍历时获得的文件类型和大小信息
         items = []
-        for item in os.listdir(directory_path):
-            item_path = os.path.join(directory_path, item)
-            is_dir = os.path.isdir(item_path)
-
-            # 只包含目录和USD文件
-            if is_dir or item.lower().endswith(('.usd', '.usda', '.usdc')):
-                items.append(
-                    FileItem(
-                        name=item,
-                        path=item_path,
-                        is_directory=is_dir,
-                        size=None if is_dir else os.path.getsize(item_path)
-                    )
-                )
+        with os.scandir(directory_path) as it:
+            for entry in it:
+                is_dir = entry.is_dir()
+
+                # 只包含目录和USD文件
+                if is_dir or entry.name.lower().endswith(('.usd', '.usda', '.usdc')):
+                    # 直接返回字典，避免为每个条目构建Pydantic模型（结构与FileItem一致）
+                    items.append({
+                        "name": entry.name,
+                        "path": entry.path,
+                        "is_directory": is_dir,
+                        "size": None if is_dir else entry.stat().st_size
+                    })
 
         # 按照目录在前，文件在后的顺序排序
-        items.sort(key=lambda x: (not x.is_directory, x.name.lower()))
+        items.sort(key=lambda x: (not x["is_directory"], x["name"].lower()))
 
         return {
             "current_path": directory_path,
@@ -135,200 +311,179 @@ async def browse_directory(directory_path: str = ""):
         }
 
     except Exception as e:
-        logging.error(f"浏览目录错误: {str(e)}")
+        logger.error("浏览目录错误: %s", str(e))
         raise HTTPException(status_code=500, detail=f"浏览目录错误: {str(e)}")
 
-@app.post("/analyze")
-async def analyze_file(file: UploadFile, file_path: str = Form(None), is_drag_drop: str = Form(None)):
-    temp_file_path = None
+def _do_analyze(file, temp_file_path, file_path, is_drag_drop):
+    """保存上传文件并进行分析（阻塞操作，在线程池中执行）"""
+    # 记录原始文件路径（如果提供）
+    original_file_path = file_path
+
     try:
-        # 保存上传的文件
-        temp_file_path = os.path.join(TEMP_DIR, file.filename)
-        logger.info(f"Saving file to: {temp_file_path}")
+        _fast_save(file, temp_file_path)
+        logger.info("Successfully saved file to: %s", temp_file_path)
 
-        try:
-            with open(temp_file_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
-            logger.info(f"Successfully saved file to: {temp_file_path}")
+        original_dir = None
 
-            # 记录原始文件路径（如果提供）
-            original_file_path = file_path
-            original_dir = None
+        # 检查是否是拖拽文件
+        is_drag_drop_file = is_drag_drop == 'true'
+        logger.info("Is drag and drop file: %s", is_drag_drop_file)
 
-            # 检查是否是拖拽文件
-            is_drag_drop_file = is_drag_drop == 'true'
-            logger.info(f"Is drag and drop file: {is_drag_drop_file}")
+        # 如果是拖拽文件，尝试查找原始文件
+        if is_drag_drop_file:
+            logger.info("Attempting to find original file for drag and drop")
 
-            # 如果是拖拽文件，尝试查找原始文件
-            if is_drag_drop_file:
-                logger.info("Attempting to find original file for drag and drop")
+            # 临时文件大小只需获取一次
+            temp_size = os.path.getsize(temp_file_path)
 
+            # 如果客户端已经提供了原始路径且文件大小一致，则无需遍历常见目录
+            if original_file_path and os.path.isfile(original_file_path) and os.path.getsize(original_file_path) == temp_size:
+                logger.info("Provided original file matches upload, skipping search: %s", original_file_path)
+            else:
                 # 尝试在常见目录中查找文件
-                common_dirs = [
-                    r"E:\filmserver\test\library\prop\all\main\lookdev\workarea\usd",
-                    r"E:\filmserver\test\library\prop",
-                    r"E:\filmserver\test\library\env",
-                    r"E:\filmserver\test\library",
-                    r"E:\filmserver\test",
-                    r"E:\filmserver"
-                ]
-
-                for common_dir in common_dirs:
-                    if os.path.exists(common_dir):
-                        logger.info(f"Searching in common directory: {common_dir}")
-
-                        # 使用os.walk遍历目录树
-                        for root, dirs, files in os.walk(common_dir):
-                            if file.filename in files:
-                                found_path = os.path.join(root, file.filename)
-                                logger.info(f"Found original file: {found_path}")
-
-                                # 比较文件大小，确认是否是同一个文件
-                                temp_size = os.path.getsize(temp_file_path)
-                                found_size = os.path.getsize(found_path)
-
-                                if temp_size == found_size:
-                                    logger.info(f"File sizes match: {temp_size} bytes")
-                                    original_file_path = found_path
-                                    original_dir = os.path.dirname(found_path)
-                                    break
-                                else:
-                                    logger.info(f"File sizes don't match: temp={temp_size}, found={found_size}")
-
-                        if original_file_path:
-                            break
-
-            if original_file_path:
-                logger.info(f"Original file path provided or found: {original_file_path}")
-                original_dir = os.path.dirname(original_file_path)
-
-                # 检查原始目录是否存在
-                if os.path.exists(original_dir):
-                    logger.info(f"Original directory exists: {original_dir}")
-                else:
-                    logger.warning(f"Original directory does not exist: {original_dir}")
-                    # 尝试创建目录结构以便测试
-                    try:
-                        os.makedirs(original_dir, exist_ok=True)
-                        logger.info(f"Created original directory: {original_dir}")
-                    except Exception as e:
-                        logger.warning(f"Could not create original directory: {str(e)}")
+                for common_dir in get_existing_dirs(DRAG_DROP_SEARCH_DIRS):
+                    logger.info("Searching in common directory: %s", common_dir)
+
+                    # 使用os.scandir递归查找，比较文件大小确认是否是同一个文件
+                    found_path = _find_by_name(common_dir, file.filename, temp_size)
+                    if found_path:
+                        logger.info("Found original file: %s", found_path)
+                        logger.info("File sizes match: %s bytes", temp_size)
+                        original_file_path = found_path
+                        original_dir = os.path.dirname(found_path)
+
+                    if original_file_path:
+                        break
+
+        if original_file_path:
+            logger.info("Original file path provided or found: %s", original_file_path)
+            original_dir = os.path.dirname(original_file_path)
+
+            # 检查原始目录是否存在
+            if os.path.exists(original_dir):
+                logger.info("Original directory exists: %s", original_dir)
             else:
-                logger.info("No original file path provided or found")
+                logger.warning("Original directory does not exist: %s", original_dir)
+                # 尝试创建目录结构以便测试
+                try:
+                    os.makedirs(original_dir, exist_ok=True)
+                    logger.info("Created original directory: %s", original_dir)
+                except Exception as e:
+                    logger.warning("Could not create original directory: %s", str(e))
+        else:
+            logger.info("No original file path provided or found")
 
-            # 如果找到了原始文件，直接分析原始文件
-            file_to_analyze = original_file_path if original_file_path and os.path.exists(original_file_path) else temp_file_path
-            logger.info(f"Analyzing file: {file_to_analyze}")
+        # 如果找到了原始文件，直接分析原始文件
+        file_to_analyze = original_file_path if original_file_path and os.path.exists(original_file_path) else temp_file_path
+        logger.info("Analyzing file: %s", file_to_analyze)
 
-            # 使用增强型分析器分析USD文件，传入原始目录信息
-            result = enhanced_analyzer.analyze_usd_file(file_to_analyze, original_dir)
-            logger.info(f"Analysis result: {result}")
-            logger.info(f"Texture list length: {len(result.get('textures', []))}")
-            logger.info(f"Texture list content: {result.get('textures', [])}")
+        # 使用增强型分析器分析USD文件，传入原始目录信息
+        # 每个请求使用独立的分析器实例，避免并发请求之间共享状态
+        result = EnhancedUsdAnalyzer().analyze_usd_file(file_to_analyze, original_dir)
+        logger.info("Texture list length: %s", len(result.get('textures', [])))
+        # 完整的分析结果可能非常大，只在DEBUG级别输出
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Analysis result: %s", result)
 
-            response_data = {
-                "filename": file.filename,
-                "original_path": original_file_path,
-                "analysis": {
-                    "success": True,
-                    "references": result["references"],
-                    "textures": result.get("textures", []),
-                    "texture_udim_counts": result.get("texture_udim_counts", {})
-                }
+        response_data = {
+            "filename": file.filename,
+            "original_path": original_file_path,
+            "analysis": {
+                "success": True,
+                "references": result["references"],
+                "textures": result.get("textures", []),
+                "texture_udim_counts": result.get("texture_udim_counts", {})
             }
-            logger.info(f"Analysis complete for file: {file.filename}")
-            logger.debug(f"Response data: {response_data}")
-            return response_data
+        }
+        logger.info("Analysis complete for file: %s", file.filename)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Response data: %s", response_data)
+        return response_data
 
-        except Exception as e:
-            logger.error(f"Error analyzing file: {str(e)}\n{traceback.format_exc()}")
-            return {
-                "filename": file.filename,
-                "original_path": original_file_path,
-                "analysis": {
-                    "success": False,
-                    "error": str(e)
-                }
+    except Exception as e:
+        logger.error("Error analyzing file: %s\n%s", str(e), traceback.format_exc())
+        return {
+            "filename": file.filename,
+            "original_path": original_file_path,
+            "analysis": {
+                "success": False,
+                "error": str(e)
             }
+        }
+
+@app.post("/analyze")
+async def analyze_file(file: UploadFile, file_path: str = Form(None), is_drag_drop: str = Form(None)):
+    # 在写入磁盘之前拒绝不支持的文件类型
+    ext = os.path.splitext(file.filename or "")[1].lower()
+    if ext not in USD_EXTENSIONS:
+        raise HTTPException(status_code=415, detail=f"不支持的文件类型: {ext}")
+
+    temp_dir = None
+    temp_file_path = None
+    try:
+        # 保存上传的文件；每个请求使用独立的子目录并保留原文件名，避免同名文件的并发上传互相覆盖
+        temp_dir = tempfile.mkdtemp(dir=TEMP_DIR)
+        temp_file_path = os.path.join(temp_dir, os.path.basename(file.filename))
+        logger.info("Saving file to: %s", temp_file_path)
+
+        # 将阻塞的保存和分析操作放到线程池中执行，避免阻塞事件循环
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, _do_analyze, file, temp_file_path, file_path, is_drag_drop)
     finally:
-        # 清理临时文件
+        # 保留文件用于调试，并供 /analyze_path 按文件名在 temp_uploads 中查找：
+        # 分析完成后将文件移动到 TEMP_DIR/<文件名>（同名文件保留最后完成的一次），再删除请求子目录
         if temp_file_path and os.path.exists(temp_file_path):
             try:
-                # 保留文件用于调试
-                # os.remove(temp_file_path)
-                pass
+                os.replace(temp_file_path, os.path.join(TEMP_DIR, os.path.basename(temp_file_path)))
             except Exception as e:
-                logger.error(f"Error removing temp file: {str(e)}")
+                logger.error("Error moving temp file: %s", str(e))
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
 
 @app.post("/analyze_path")
 async def analyze_file_path(file_path: str = Form(...)):
     try:
         # Record original file path
-        logger.info(f"Received file path: {file_path}")
+        logger.info("Received file path: %s", file_path)
 
         # Normalize file path, handle possible path format issues
         clean_path = file_path.strip()
-        logger.info(f"Cleaned path: {clean_path}")
+        logger.info("Cleaned path: %s", clean_path)
 
         # 保存原始路径用于错误报告
         original_path = clean_path
 
+        # 统一路径分隔符：先将 \ 替换为当前系统的分隔符（POSIX上normpath不会处理 \，
+        # 从Windows复制的路径否则无法找到），Windows上normpath会将 / 统一转换为 \
+        clean_path = os.path.normpath(clean_path.replace('\\', os.sep))
+
         # 检查是否是相对路径
         if not os.path.isabs(clean_path):
-            logger.info(f"处理相对路径: {clean_path}")
+            logger.info("处理相对路径: %s", clean_path)
             # 尝试转换为绝对路径
             abs_path = os.path.abspath(clean_path)
-            logger.info(f"转换为绝对路径: {abs_path}")
+            logger.info("转换为绝对路径: %s", abs_path)
             if os.path.exists(abs_path):
                 clean_path = abs_path
-                logger.info(f"成功转换为绝对路径: {clean_path}")
-
-        # Try different path formats
-        if not os.path.exists(clean_path):
-            # Try replacing path separators
-            alt_path1 = clean_path.replace('\\', '/')
-            alt_path2 = clean_path.replace('/', '\\')
-
-            logger.info(f"Trying alternative path 1: {alt_path1}")
-            logger.info(f"Trying alternative path 2: {alt_path2}")
-
-            if os.path.exists(alt_path1):
-                clean_path = alt_path1
-                logger.info(f"Successfully used alternative path 1")
-            elif os.path.exists(alt_path2):
-                clean_path = alt_path2
-                logger.info(f"Successfully used alternative path 2")
+                logger.info("成功转换为绝对路径: %s", clean_path)
 
         # 如果仍然找不到文件，尝试在常见目录中查找
         if not os.path.exists(clean_path):
-            logger.info(f"在常见目录中查找文件: {os.path.basename(clean_path)}")
+            logger.info("在常见目录中查找文件: %s", os.path.basename(clean_path))
 
             # 尝试在常见目录中查找文件
-            common_dirs = [
-                r"E:\filmserver\test\library\prop\all\main\lookdev\workarea\usd",
-                r"E:\filmserver\test\library\prop\all\main\lookdev\publish\v001",
-                r"E:\filmserver\test\library\env\test\aa\lookdev\publish\v001",
-                r"E:\filmserver\test\library\prop",
-                r"E:\filmserver\test\library\env",
-                r"E:\filmserver\test\library",
-                r"E:\filmserver\test",
-                r"E:\filmserver",
-                r"E:\Project\USD_Web_Analysis\backend\temp_uploads"
-            ]
-
             filename = os.path.basename(clean_path)
-            for common_dir in common_dirs:
-                if os.path.exists(common_dir):
-                    test_path = os.path.join(common_dir, filename)
-                    logger.info(f"尝试路径: {test_path}")
-                    if os.path.exists(test_path):
-                        clean_path = test_path
-                        logger.info(f"在常见目录中找到文件: {clean_path}")
-                        break
+            for common_dir in get_existing_dirs(PATH_SEARCH_DIRS):
+                test_path = os.path.join(common_dir, filename)
+                logger.info("尝试路径: %s", test_path)
+                if os.path.exists(test_path):
+                    clean_path = test_path
+                    logger.info("在常见目录中找到文件: %s", clean_path)
+                    break
 
         # Check if file exists
         if not os.path.exists(clean_path):
-            logger.error(f"File does not exist: {clean_path} (original: {original_path})")
+            logger.error("File does not exist: %s (original: %s)", clean_path, original_path)
             return {
                 "filename": os.path.basename(clean_path),
                 "analysis": {
@@ -337,26 +492,26 @@ async def analyze_file_path(file_path: str = Form(...)):
                 }
             }
 
-        logger.info(f"Directly analyzing file path: {clean_path}")
+        logger.info("Directly analyzing file path: %s", clean_path)
 
         # Get the original directory for resolving relative paths
         original_dir = os.path.dirname(clean_path)
-        logger.info(f"Original directory: {original_dir}")
+        logger.info("Original directory: %s", original_dir)
 
         # Reset analyzer state
         enhanced_analyzer.reset()
 
         # Use enhanced analyzer to analyze USD file, passing original directory info
         result = enhanced_analyzer.analyze_usd_file(clean_path, original_dir)
-        logger.info(f"Analysis result: {result}")
-        logger.info(f"Texture list length: {len(result.get('textures', []))}")
+        logger.info("Texture list length: %s", len(result.get('textures', [])))
 
-        # Add more detailed log output
+        # Add more detailed log output (large dumps only at DEBUG level)
         if result.get('textures'):
-            logger.info(f"First 5 texture items: {result.get('textures', [])[:5]}")
-            if result.get('textures'):
-                logger.info(f"Keys of first texture item: {list(result.get('textures', [])[0].keys()) if result.get('textures') else 'None'}")
-                logger.info(f"Values of first texture item: {result.get('textures', [])[0] if result.get('textures') else 'None'}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Analysis result: %s", result)
+                logger.debug("First 5 texture items: %s", result.get('textures', [])[:5])
+                logger.debug("Keys of first texture item: %s", list(result.get('textures', [])[0].keys()))
+                logger.debug("Values of first texture item: %s", result.get('textures', [])[0])
         else:
             logger.warning("Texture list is empty")
 
@@ -371,12 +526,13 @@ async def analyze_file_path(file_path: str = Form(...)):
         }
 
         # Log complete response data
-        logger.info(f"Response data: {response_data}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Response data: %s", response_data)
 
         return response_data
 
     except Exception as e:
-        logger.error(f"Error analyzing file: {str(e)}\n{traceback.format_exc()}")
+        logger.error("Error analyzing file: %s\n%s", str(e), traceback.format_exc())
         return {
             "filename": os.path.basename(file_path) if file_path else "Unknown file",
             "analysis": {
@@ -389,71 +545,248 @@ async def analyze_file_path(file_path: str = Form(...)):
 async def analyze_file_path(file_path: str):
     """分析指定路径的USD文件"""
     try:
-        # 检查文件是否存在
-        if not os.path.exists(file_path):
+        # 检查文件是否存在，同时获取修改时间和大小作为缓存键
+        try:
+            stat = os.stat(file_path)
+        except OSError:
             return {"success": False, "error": f"文件不存在: {file_path}"}
 
         # 检查文件扩展名
         _, ext = os.path.splitext(file_path)
-        if ext.lower() not in ['.usd', '.usda', '.usdc', '.usdz']:
+        if ext.lower() not in USD_EXTENSIONS:
             return {"success": False, "error": f"不支持的文件类型: {ext}"}
 
-        # 分析USD文件
-        analyzer = EnhancedUsdAnalyzer()
-        result = analyzer.analyze_usd_file(file_path)
-
-        # 构建响应
-        response = {
-            "success": True,
-            "references": result["references"],
-            "textures": [
-                {
-                    "path": texture["path"],
-                    "source": texture["source"],
-                    "exists": texture.get("exists", True),
-                    "type": "UDIM" if "<UDIM>" in texture["path"] or "<udim>" in texture["path"] else "regular",
-                    "actual_texture_count": texture.get("actual_texture_count", result.get("texture_udim_counts", {}).get(texture["path"], 1))
-                }
-                for texture in result["textures"]
-            ],
-            "texture_udim_counts": result.get("texture_udim_counts", {})
-        }
-
-        return response
+        # 文件未修改时直接返回缓存的分析结果；未命中缓存时的分析是阻塞操作，放到线程池中执行，避免阻塞事件循环
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, _analyze_file_path_cached, file_path, stat.st_mtime_ns, stat.st_size)
     except Exception as e:
-        logger.error(f"分析文件失败: {str(e)}")
+        logger.error("分析文件失败: %s", str(e))
         logger.error(traceback.format_exc())
         return {"success": False, "error": f"分析文件失败: {str(e)}"}
 
-@app.post("/package")
-async def package_files(request: PackageRequest):
-    """将分析出的USD文件和贴图打包到指定路径"""
+@lru_cache(maxsize=ANALYSIS_CACHE_SIZE)
+def _analyze_file_path_cached(file_path, mtime_ns, size):
+    """分析USD文件并构建响应，结果按(路径, 修改时间, 大小)缓存，调用方不应修改返回值。
+    缓存键只包含根文件本身的修改时间和大小：根文件不变而其引用的层或贴图发生变化时，会返回过期的结果，直到缓存条目被淘汰"""
+    # 分析USD文件
+    analyzer = EnhancedUsdAnalyzer()
+    result = analyzer.analyze_usd_file(file_path)
+
+    # 构建响应
+    response = {
+        "success": True,
+        "references": result["references"],
+        "textures": [
+            {
+                "path": texture["path"],
+                "source": texture["source"],
+                "exists": texture.get("exists", True),
+                "type": "UDIM" if "<UDIM>" in texture["path"] or "<udim>" in texture["path"] else "regular",
+                "actual_texture_count": texture.get("actual_texture_count", result.get("texture_udim_counts", {}).get(texture["path"], 1))
+            }
+            for texture in result["textures"]
+        ],
+        "texture_udim_counts": result.get("texture_udim_counts", {})
+    }
+
+    return response
+
+def _filmserver_relative_path(path):
+    """提取filmserver之后的相对路径，路径中不包含filmserver时返回None"""
+    match = FILMSERVER_RE.match(path)
+    if not match:
+        return None
+    return match.group(1).replace('\\', '/')
+
+def _list_dir_files(dir_path, dir_cache):
+    """列出目录中的文件(名称, 路径)，结果缓存在dir_cache中；目录无法读取时返回None"""
+    if dir_path not in dir_cache:
+        try:
+            with os.scandir(dir_path) as it:
+                dir_cache[dir_path] = [(entry.name, entry.path) for entry in it if entry.is_file()]
+        except OSError:
+            dir_cache[dir_path] = None
+    return dir_cache[dir_path]
+
+def _file_exists(path, dir_cache, name_cache):
+    """借助目录列表判断文件是否存在，同一目录只扫描一次"""
+    dir_path, name = os.path.split(path)
+    if dir_path not in name_cache:
+        dir_files = _list_dir_files(dir_path, dir_cache)
+        name_cache[dir_path] = None if dir_files is None else {file_name for file_name, _ in dir_files}
+    names = name_cache[dir_path]
+    if names is not None and name in names:
+        return True
+    # 未命中时回退到逐个检查（兼容大小写不敏感的文件系统）
+    return os.path.isfile(path)
+
+def _key_folder_index(parts, key_folders):
+    """按key_folders的优先级查找路径中首个出现的关键目录，返回其位置索引；未找到时返回-1"""
+    # 单次遍历记录每个目录名第一次出现的位置，避免对每个关键目录重复线性扫描
+    first_index = {}
+    for index, part in enumerate(parts):
+        first_index.setdefault(part, index)
+    return next((first_index[key] for key in key_folders if key in first_index), -1)
+
+def _texture_dir_info(file_path, dir_info_cache):
+    """返回文件所在目录的规范化路径、路径各部分和关键目录位置，同一目录的多个贴图（如UDIM序列）只计算一次"""
+    dir_path = os.path.dirname(file_path)
+    info = dir_info_cache.get(dir_path)
+    if info is None:
+        tex_dir = dir_path.replace('\\', '/')
+        tex_dir_parts = tex_dir.split('/')
+        info = (tex_dir, tex_dir_parts, _key_folder_index(tex_dir_parts, TEXTURE_KEY_FOLDERS))
+        dir_info_cache[dir_path] = info
+    return info
+
+def _texture_relative_path(texture_file: str, source_dir_norm: str, dir_info_cache: dict) -> str:
+    """计算贴图在打包目录中的相对路径，保持原始目录结构（纯字符串处理，不访问文件系统）"""
+    # 如果路径包含filmserver，以filmserver后的部分作为相对路径
+    tex_relative_path = _filmserver_relative_path(texture_file)
+    if tex_relative_path:
+        logger.info("从filmserver路径提取贴图路径: %s -> %s", texture_file, tex_relative_path)
+        return tex_relative_path
+
+    # 尝试多种方法来确定合适的相对路径
+    tex_basename = os.path.basename(texture_file)
+    tex_dir, tex_dir_parts, key_index = _texture_dir_info(texture_file, dir_info_cache)
+
+    # 方法1: 如果贴图文件在源文件的子目录中，保持相对结构
+    if tex_dir.startswith(source_dir_norm):
+        tex_relative_path = f"{tex_dir}/{tex_basename}"[len(source_dir_norm):].lstrip('/')
+        logger.info("使用源文件子目录相对路径(贴图): %s -> %s", texture_file, tex_relative_path)
+    # 方法2: 查找关键目录标识符，从关键文件夹开始保留路径结构
+    elif key_index >= 0:
+        tex_relative_path = '/'.join(tex_dir_parts[key_index:] + [tex_basename])
+        logger.info("使用关键目录标识符相对路径(贴图): %s -> %s", texture_file, tex_relative_path)
+    # 方法3: 如果前两种方法都不适用，使用父目录+文件名
+    else:
+        tex_relative_path = f"{tex_dir_parts[-1]}/{tex_basename}"
+        logger.info("使用父目录+文件名相对路径(贴图): %s -> %s", texture_file, tex_relative_path)
+    return tex_relative_path
+
+def _ensure_dir(dir_path, created_dirs):
+    """确保目录存在，同一次打包中已处理过的目录直接跳过"""
+    if dir_path in created_dirs:
+        return
+    os.makedirs(dir_path, exist_ok=True)
+    created_dirs.add(dir_path)
+
+def _copy_file(src, dst):
+    """复制单个文件，保留文件元数据（Python 3.8+的shutil在Linux上会自动使用sendfile）"""
+    # 目标已经是源文件本身（同一路径，或重复打包到同一目录时之前留下的硬链接）时无需复制；
+    # 此时绝不能删除目标，否则会删掉源文件
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        return
+    if PACK_USE_HARDLINKS:
+        try:
+            os.link(src, dst)
+            return
+        except FileExistsError:
+            # 目标是其他文件（可能是另一个源文件的硬链接），先删除再链接，不能在原文件上写入
+            os.unlink(dst)
+            try:
+                os.link(src, dst)
+                return
+            except OSError:
+                pass
+        except OSError:
+            # 跨文件系统或不支持硬链接时回退到复制
+            pass
+    # 下面的复制会在已存在的目标文件上原地写入；目标有多个硬链接时（例如之前启用硬链接的打包结果）
+    # 会连带改写其链接的源文件，因此先删除目标
+    try:
+        if os.stat(dst).st_nlink > 1:
+            os.unlink(dst)
+    except FileNotFoundError:
+        pass
+    if _CopyFileExW is not None:
+        if _CopyFileExW(src, dst, None, None, None, 0):
+            shutil.copystat(src, dst)
+            return
+        logger.warning("CopyFileExW复制失败: %s -> %s, 错误码: %s，改用shutil复制", src, dst, ctypes.get_last_error())
+    shutil.copy2(src, dst)
+
+def _safe_copy(job):
+    """执行单个复制任务，失败时记录错误并返回False"""
+    src, dst, _ = job
+    try:
+        _copy_file(src, dst)
+        logger.info("成功复制文件: %s -> %s", src, dst)
+        return True
+    except Exception as e:
+        logger.error("复制文件失败: %s -> %s, 错误: %s", src, dst, str(e))
+        logger.error(traceback.format_exc())
+        return False
+
+def _queue_copy_job(queued_targets, jobs, duplicates, src, dst, record):
+    """将复制任务按目标路径加入jobs，返回是否新加入；同一目标已有相同来源时不再复制，只在duplicates中记录带deduplicated标记的条目。
+    不同来源对应同一目标时仅保留最后一个（与逐个复制时后者覆盖前者一致），保证同一目标文件不会被两个任务并行写入"""
+    queued = queued_targets.get(dst)
+    if queued is not None:
+        queued_src, queued_jobs = queued
+        if queued_src == src:
+            logger.info("文件已在复制任务中，跳过重复复制: %s", src)
+            duplicates.append({**record, "deduplicated": True})
+            return False
+        logger.warning("多个源文件对应同一目标文件: %s, %s -> %s，使用后者", queued_src, src, dst)
+        if queued_jobs is not None:
+            queued_jobs.pop(dst, None)
+    queued_targets[dst] = (src, jobs)
+    jobs[dst] = (src, dst, record)
+    return True
+
+def _run_copy_jobs(jobs, on_copied=None):
+    """使用线程池并行执行复制任务，返回成功复制的文件记录列表（保持原有顺序）；
+    提供on_copied时按完成顺序每复制成功一个文件调用一次，较慢的文件不会推迟其后已完成文件的进度"""
+    if not jobs:
+        return []
+    succeeded = [False] * len(jobs)
+    # 目标目录已在解析阶段创建，这里的并行复制不会产生目录竞争
+    with ThreadPoolExecutor(max_workers=min(COPY_MAX_WORKERS, len(jobs))) as executor:
+        futures = {executor.submit(_safe_copy, job): index for index, job in enumerate(jobs)}
+        for future in as_completed(futures):
+            index = futures[future]
+            if future.result():
+                succeeded[index] = True
+                if on_copied:
+                    on_copied(jobs[index][2])
+    return [record for (_, _, record), ok in zip(jobs, succeeded) if ok]
+
+def _do_package(request, on_copied=None):
+    """将分析出的USD文件和贴图打包到指定路径（阻塞操作，在线程池中执行）"""
     try:
         # 打印请求信息以便调试
-        logger.info(f"收到打包请求: file_path={request.file_path}, output_path={request.output_path}")
+        logger.info("收到打包请求: file_path=%s, output_path=%s", request.file_path, request.output_path)
 
         # 检查输入文件是否存在
         if not os.path.exists(request.file_path):
-            logger.error(f"源文件不存在: {request.file_path}")
+            logger.error("源文件不存在: %s", request.file_path)
             # 尝试解决可能的路径问题
             normalized_path = request.file_path.replace('\\', '/')
             if os.path.exists(normalized_path):
-                logger.info(f"使用规范化路径成功: {normalized_path}")
+                logger.info("使用规范化路径成功: %s", normalized_path)
                 request.file_path = normalized_path
             else:
                 # 尝试其他可能的路径格式
                 alternative_path = request.file_path.replace('/', '\\')
                 if os.path.exists(alternative_path):
-                    logger.info(f"使用替代路径成功: {alternative_path}")
+                    logger.info("使用替代路径成功: %s", alternative_path)
                     request.file_path = alternative_path
                 else:
                     return {"success": False, "message": f"源文件不存在: {request.file_path}\n已尝试路径: {normalized_path}, {alternative_path}"}
 
-        # 检查输出路径是否存在，如果不存在则创建
+        # 记录本次打包中已创建的目录，避免重复的mkdir调用
+        created_dirs = set()
+
+        # 已加入复制任务的目标文件及其(来源, 所在任务表)，多个材质引用同一贴图时只复制一次
+        queued_targets = {}
+
+        # 创建输出目录（已存在时不做任何操作）
         output_path = request.output_path
-        if not os.path.exists(output_path):
-            os.makedirs(output_path, exist_ok=True)
-            logger.info(f"创建输出目录: {output_path}")
+        _ensure_dir(output_path, created_dirs)
+        # 目标路径统一用'/'拼接（Windows同样支持），避免在循环中反复调用os.path.join
+        output_prefix = output_path.rstrip('/\\')
 
         # 复制主USD文件
         source_file = request.file_path
@@ -462,335 +795,212 @@ async def package_files(request: PackageRequest):
         # 提取相对路径部分
         # 假设文件路径格式为 E:/filmserver/test/library/prop/bb/main/USD/lookdev/main.usda
         # 我们需要提取 test/library/prop/bb/main/USD/lookdev/main.usda 部分
-        path_parts = source_file.replace('\\', '/').split('/')
-        if 'filmserver' in path_parts:
-            # 找到filmserver的索引
-            filmserver_index = path_parts.index('filmserver')
-            if filmserver_index + 1 < len(path_parts):
-                relative_path = '/'.join(path_parts[filmserver_index+1:])
-            else:
-                relative_path = file_name
-        else:
+        relative_path = _filmserver_relative_path(source_file)
+        if not relative_path:
             # 如果找不到filmserver，则使用完整的文件名
             relative_path = file_name
 
         # 创建目标文件路径
-        target_file = os.path.join(output_path, relative_path)
+        target_file = f"{output_prefix}/{relative_path}"
         target_dir = os.path.dirname(target_file)
 
         # 确保目标目录存在
-        if not os.path.exists(target_dir):
-            os.makedirs(target_dir, exist_ok=True)
+        _ensure_dir(target_dir, created_dirs)
 
         # 复制主USD文件
-        shutil.copy2(source_file, target_file)
-        logger.info(f"复制主USD文件: {source_file} -> {target_file}")
+        _copy_file(source_file, target_file)
+        if on_copied:
+            on_copied({"source": source_file, "target": target_file, "type": "main"})
+        queued_targets[target_file] = (source_file, None)
+        logger.info("复制主USD文件: %s -> %s", source_file, target_file)
+
+        # 源文件目录只需规范化一次，供引用和贴图的相对路径计算使用
+        source_dir_norm = os.path.dirname(source_file).replace('\\', '/')
+
+        # 本次打包中已扫描过的目录内容，位于同一目录的引用和贴图只扫描一次
+        dir_cache = {}
+        name_cache = {}
+        # 贴图所在目录的路径解析结果，同一目录下的贴图共用
+        dir_info_cache = {}
 
         # 复制引用的USD文件 - 严格按照分析结果一比一复制，保留完整路径结构
-        copied_references = []
+        reference_jobs = {}
+        duplicate_references = []
         for ref in request.references:
             ref_path = ref.get('path')
             ref_type = ref.get('type', 'reference')
             if not ref_path:
-                logger.warning(f"引用路径为空，跳过")
+                logger.warning("引用路径为空，跳过")
                 continue
 
             # 检查文件是否存在，记录详细信息
-            if not os.path.exists(ref_path):
-                logger.warning(f"引用文件不存在: {ref_path}，类型: {ref_type}，跳过")
+            if not _file_exists(ref_path, dir_cache, name_cache):
+                logger.warning("引用文件不存在: %s，类型: %s，跳过", ref_path, ref_type)
                 continue
 
-            logger.info(f"处理引用文件: {ref_path}, 类型: {ref_type}")
+            logger.info("处理引用文件: %s, 类型: %s", ref_path, ref_type)
 
             # 提取相对路径 - 保持原始目录结构，包括aa/USD/部分
-            ref_path_parts = ref_path.replace('\\', '/').split('/')
-
-            # 处理不同类型的路径
-            if 'filmserver' in ref_path_parts:
-                # 如果路径包含filmserver，以filmserver后的部分作为相对路径
-                ref_server_index = ref_path_parts.index('filmserver')
-                if ref_server_index + 1 < len(ref_path_parts):
-                    ref_relative_path = '/'.join(ref_path_parts[ref_server_index+1:])
-                else:
-                    ref_relative_path = os.path.basename(ref_path)
-                logger.info(f"从filmserver路径提取: {ref_path} -> {ref_relative_path}")
+            # 如果路径包含filmserver，以filmserver后的部分作为相对路径
+            ref_relative_path = _filmserver_relative_path(ref_path)
+            if ref_relative_path:
+                logger.info("从filmserver路径提取: %s -> %s", ref_path, ref_relative_path)
             else:
                 # 尝试多种方法来确定合适的相对路径
-                source_dir = os.path.dirname(source_file).replace('\\', '/')
+                ref_path_parts = ref_path.replace('\\', '/').split('/')
                 ref_dir = os.path.dirname(ref_path).replace('\\', '/')
 
                 # 方法1: 如果引用文件在源文件的子目录中，保持相对结构
-                if ref_dir.startswith(source_dir):
-                    ref_relative_path = ref_path.replace(source_dir, '').lstrip('/')
-                    logger.info(f"使用源文件子目录相对路径: {ref_path} -> {ref_relative_path}")
+                if ref_dir.startswith(source_dir_norm):
+                    ref_relative_path = ref_path.replace('\\', '/')[len(source_dir_norm):].lstrip('/')
+                    logger.info("使用源文件子目录相对路径: %s -> %s", ref_path, ref_relative_path)
                 else:
                     # 方法2: 查找关键目录标识符
-                    key_folders = ['USD', 'usd', 'assets', 'scenes', 'shots', 'env', 'aa']
-                    found_key_folder = False
-
-                    for key_folder in key_folders:
-                        if key_folder in ref_path_parts:
-                            # 从关键文件夹开始保留路径结构
-                            key_index = ref_path_parts.index(key_folder)
-                            ref_relative_path = '/'.join(ref_path_parts[key_index:])
-                            logger.info(f"使用关键目录标识符相对路径: {ref_path} -> {ref_relative_path}")
-                            found_key_folder = True
-                            break
-
-                    # 方法3: 如果前两种方法都不适用，使用父目录+文件名
-                    if not found_key_folder:
+                    key_index = _key_folder_index(ref_path_parts, REFERENCE_KEY_FOLDERS)
+                    if key_index >= 0:
+                        # 从关键文件夹开始保留路径结构
+                        ref_relative_path = '/'.join(ref_path_parts[key_index:])
+                        logger.info("使用关键目录标识符相对路径: %s -> %s", ref_path, ref_relative_path)
+                    else:
+                        # 方法3: 如果前两种方法都不适用，使用父目录+文件名
                         parent_dir = os.path.basename(os.path.dirname(ref_path))
-                        ref_relative_path = os.path.join(parent_dir, os.path.basename(ref_path))
-                        logger.info(f"使用父目录+文件名相对路径: {ref_path} -> {ref_relative_path}")
+                        ref_relative_path = f"{parent_dir}/{os.path.basename(ref_path)}"
+                        logger.info("使用父目录+文件名相对路径: %s -> %s", ref_path, ref_relative_path)
 
             # 创建目标引用文件路径
-            ref_target_file = os.path.join(output_path, ref_relative_path)
+            ref_target_file = f"{output_prefix}/{ref_relative_path}"
             ref_target_dir = os.path.dirname(ref_target_file)
 
-            # 确保目标目录存在
-            if not os.path.exists(ref_target_dir):
-                os.makedirs(ref_target_dir, exist_ok=True)
-                logger.info(f"创建目录: {ref_target_dir}")
+            # 加入复制任务，稍后统一执行；同一源文件已加入复制任务时不再重复写入相同内容，只记录去重条目
+            if not _queue_copy_job(queued_targets, reference_jobs, duplicate_references, ref_path, ref_target_file, {
+                "source": ref_path,
+                "target": ref_target_file,
+                "type": ref_type
+            }):
+                continue
 
-            # 复制引用文件
-            try:
-                shutil.copy2(ref_path, ref_target_file)
-                copied_references.append({
-                    "source": ref_path,
-                    "target": ref_target_file,
-                    "type": ref_type
-                })
-                logger.info(f"成功复制引用文件: {ref_path} -> {ref_target_file}")
-            except Exception as e:
-                logger.error(f"复制引用文件失败: {ref_path} -> {ref_target_file}, 错误: {str(e)}")
-                logger.error(traceback.format_exc())
+            # 确保目标目录存在
+            _ensure_dir(ref_target_dir, created_dirs)
 
         # 复制贴图文件 - 严格按照分析结果一比一复制，增强对UDIM贴图的支持
-        copied_textures = []
+        texture_jobs = {}
+        duplicate_textures = []
         for texture in request.textures:
             texture_path = texture.get('path')
             if not texture_path:
-                logger.warning(f"贴图路径为空，跳过")
+                logger.warning("贴图路径为空，跳过")
                 continue
 
             # 获取贴图的额外信息
             texture_source = texture.get('source', '')
             texture_type = texture.get('type', '')
-            is_udim_from_analysis = any(pattern in texture_path for pattern in ['<UDIM>', '<udim>', '.####.', '.<UDIM>.', '.<udim>.'])
+            udim_match = UDIM_PLACEHOLDER_RE.search(texture_path)
             udim_count = texture.get('udim_count', 0)
             actual_texture_count = texture.get('actual_texture_count', 0)
 
-            logger.info(f"处理贴图: {texture_path}, 来源: {texture_source}, 类型: {texture_type}, UDIM: {is_udim_from_analysis}, 实际贴图数: {actual_texture_count}")
-
-            # 检查是否是UDIM贴图 - 支持更多的UDIM模式
-            is_udim = False
-            udim_pattern = None
-            udim_placeholder = None
-
-            # 支持多种UDIM模式
-            if "<UDIM>" in texture_path:
-                is_udim = True
-                udim_placeholder = "<UDIM>"
-                udim_pattern = texture_path.replace("<UDIM>", "*")
-            elif "<udim>" in texture_path:
-                is_udim = True
-                udim_placeholder = "<udim>"
-                udim_pattern = texture_path.replace("<udim>", "*")
-            elif ".####." in texture_path:
-                is_udim = True
-                udim_placeholder = ".####."
-                udim_pattern = texture_path.replace(".####.", ".*.")  # 使用通配符匹配UDIM数字
-            elif ".<UDIM>." in texture_path:
-                is_udim = True
-                udim_placeholder = ".<UDIM>."
-                udim_pattern = texture_path.replace(".<UDIM>.", ".*.")
-            elif ".<udim>." in texture_path:
-                is_udim = True
-                udim_placeholder = ".<udim>."
-                udim_pattern = texture_path.replace(".<udim>.", ".*.")
-
-            if is_udim and udim_pattern:
+            logger.info("处理贴图: %s, 来源: %s, 类型: %s, UDIM: %s, 实际贴图数: %s", texture_path, texture_source, texture_type, udim_match is not None, actual_texture_count)
+
+            # 检查是否是UDIM贴图 - 支持多种UDIM模式
+            if udim_match:
+                udim_placeholder = udim_match.group(1)
+                glob_replacement, regex_replacement = UDIM_PLACEHOLDER_INFO[udim_placeholder]
+                # 使用通配符匹配UDIM数字
+                udim_pattern = texture_path.replace(udim_placeholder, glob_replacement)
+
                 # 对于UDIM贴图，需要查找所有匹配的文件
                 udim_dir = os.path.dirname(texture_path)
-                if not os.path.exists(udim_dir):
-                    logger.warning(f"UDIM贴图目录不存在: {udim_dir}，跳过")
+                udim_dir_files = _list_dir_files(udim_dir, dir_cache)
+                if udim_dir_files is None:
+                    logger.warning("UDIM贴图目录不存在: %s，跳过", udim_dir)
                     continue
 
                 # 获取文件名部分（不含路径）
                 udim_basename = os.path.basename(udim_pattern)
-                # 在目录中查找所有匹配的文件
-                import glob
-                import re
-
-                # 使用更精确的匹配模式
-                matching_files = glob.glob(os.path.join(udim_dir, udim_basename))
-
-                # 验证匹配的文件确实是UDIM序列
-                verified_udim_files = []
 
-                # 提取基本文件名（不含UDIM数字）
+                # 提取基本文件名，将UDIM占位符替换为正则表达式模式
                 base_filename = os.path.basename(texture_path)
-                if udim_placeholder:
-                    # 替换UDIM占位符为正则表达式模式
-                    if udim_placeholder in ["<UDIM>", "<udim>"]:
-                        base_pattern = base_filename.replace(udim_placeholder, r"(\d{4})")
-                    elif udim_placeholder == ".####.":
-                        base_pattern = base_filename.replace(udim_placeholder, r"\.(\d{4})\.")
-                    elif udim_placeholder in [".<UDIM>.", ".<udim>."]:
-                        base_pattern = base_filename.replace(udim_placeholder, r"\.(\d{4})\.")
-                    else:
-                        # 默认模式
-                        base_pattern = base_filename.replace(udim_placeholder, r"(\d{4})")
-
-                    # 编译正则表达式
-                    pattern = re.compile(base_pattern)
+                prefix, _, suffix = base_filename.partition(udim_placeholder)
+                pattern = re.compile(re.escape(prefix) + regex_replacement + re.escape(suffix))
 
-                    # 验证每个匹配的文件
-                    for file_path in matching_files:
-                        file_name = os.path.basename(file_path)
-                        match = pattern.match(file_name)
-                        if match and 1000 <= int(match.group(1)) <= 1999:  # UDIM范围通常是1001-1999
-                            verified_udim_files.append(file_path)
-                            logger.info(f"验证UDIM贴图: {file_path}, UDIM索引: {match.group(1)}")
+                # 单次遍历目录中的文件，同时收集通配符匹配的文件和验证通过的UDIM序列
+                matching_files = []
+                verified_udim_files = []
+                for entry_name, entry_path in udim_dir_files:
+                    if not fnmatch.fnmatch(entry_name, udim_basename):
+                        continue
+                    matching_files.append(entry_path)
+                    match = pattern.match(entry_name)
+                    if match and 1000 <= int(match.group(1)) <= 1999:  # UDIM范围通常是1001-1999
+                        verified_udim_files.append(entry_path)
+                        logger.info("验证UDIM贴图: %s, UDIM索引: %s", entry_path, match.group(1))
 
                 # 如果没有验证通过的UDIM文件，尝试使用原始匹配结果
                 if not verified_udim_files and matching_files:
-                    logger.warning(f"未能验证UDIM序列，使用所有匹配文件: {matching_files}")
+                    logger.warning("未能验证UDIM序列，使用所有匹配文件: %s", matching_files)
                     verified_udim_files = matching_files
 
                 if not verified_udim_files:
-                    logger.warning(f"未找到匹配的UDIM贴图: {os.path.join(udim_dir, udim_basename)}，跳过")
+                    logger.warning("未找到匹配的UDIM贴图: %s，跳过", os.path.join(udim_dir, udim_basename))
                     continue
 
-                logger.info(f"找到 {len(verified_udim_files)} 个匹配的UDIM贴图: {verified_udim_files}")
+                logger.info("找到 %s 个匹配的UDIM贴图: %s", len(verified_udim_files), verified_udim_files)
 
                 # 使用验证过的UDIM文件列表进行复制
+                # 目录列表中的条目均为文件，无需再逐个检查是否存在
                 for matching_file in verified_udim_files:
-                    if os.path.isfile(matching_file):
-                        # 提取相对路径 - 保持原始目录结构
-                        tex_path_parts = matching_file.replace('\\', '/').split('/')
-
-                        # 处理不同类型的路径
-                        if 'filmserver' in tex_path_parts:
-                            # 如果路径包含filmserver，以filmserver后的部分作为相对路径
-                            tex_server_index = tex_path_parts.index('filmserver')
-                            if tex_server_index + 1 < len(tex_path_parts):
-                                tex_relative_path = '/'.join(tex_path_parts[tex_server_index+1:])
-                            else:
-                                tex_relative_path = os.path.basename(matching_file)
-                            logger.info(f"从filmserver路径提取贴图路径: {matching_file} -> {tex_relative_path}")
-                        else:
-                            # 尝试多种方法来确定合适的相对路径
-                            source_dir = os.path.dirname(source_file).replace('\\', '/')
-                            tex_dir = os.path.dirname(matching_file).replace('\\', '/')
-
-                            # 方法1: 如果贴图文件在源文件的子目录中，保持相对结构
-                            if tex_dir.startswith(source_dir):
-                                tex_relative_path = matching_file.replace(source_dir, '').lstrip('/')
-                                logger.info(f"使用源文件子目录相对路径(贴图): {matching_file} -> {tex_relative_path}")
-                            else:
-                                # 方法2: 查找关键目录标识符
-                                key_folders = ['texture', 'textures', 'tex', 'maps', 'images', 'txt', 'publish', 'USD', 'usd', 'assets']
-                                found_key_folder = False
-
-                                tex_dir_parts = tex_dir.split('/')
-                                for key_folder in key_folders:
-                                    if key_folder in tex_dir_parts:
-                                        # 从关键文件夹开始保留路径结构
-                                        key_index = tex_dir_parts.index(key_folder)
-                                        tex_relative_path = '/'.join(tex_dir_parts[key_index:] + [os.path.basename(matching_file)])
-                                        logger.info(f"使用关键目录标识符相对路径(贴图): {matching_file} -> {tex_relative_path}")
-                                        found_key_folder = True
-                                        break
-
-                                # 方法3: 如果前两种方法都不适用，使用父目录+文件名
-                                if not found_key_folder:
-                                    parent_dir = os.path.basename(os.path.dirname(matching_file))
-                                    tex_relative_path = os.path.join(parent_dir, os.path.basename(matching_file))
-                                    logger.info(f"使用父目录+文件名相对路径(贴图): {matching_file} -> {tex_relative_path}")
-
-                        # 创建目标贴图文件路径
-                        tex_target_file = os.path.join(output_path, tex_relative_path)
-                        tex_target_dir = os.path.dirname(tex_target_file)
-
-                        # 确保目标目录存在
-                        if not os.path.exists(tex_target_dir):
-                            os.makedirs(tex_target_dir, exist_ok=True)
-
-                        # 复制贴图文件
-                        shutil.copy2(matching_file, tex_target_file)
-                        copied_textures.append({
-                            "source": matching_file,
-                            "target": tex_target_file,
-                            "type": "UDIM",
-                            "source_info": texture_source
-                        })
-                        logger.info(f"复制UDIM贴图: {matching_file} -> {tex_target_file}")
-            elif os.path.exists(texture_path):
+                    tex_relative_path = _texture_relative_path(matching_file, source_dir_norm, dir_info_cache)
+
+                    # 创建目标贴图文件路径
+                    tex_target_file = f"{output_prefix}/{tex_relative_path}"
+                    tex_target_dir = os.path.dirname(tex_target_file)
+
+                    # 加入复制任务，稍后统一执行；同一源文件已加入复制任务时不再重复写入相同内容，只记录去重条目
+                    if not _queue_copy_job(queued_targets, texture_jobs, duplicate_textures, matching_file, tex_target_file, {
+                        "source": matching_file,
+                        "target": tex_target_file,
+                        "type": "UDIM",
+                        "source_info": texture_source
+                    }):
+                        continue
+
+                    # 确保目标目录存在
+                    _ensure_dir(tex_target_dir, created_dirs)
+            elif _file_exists(texture_path, dir_cache, name_cache):
                 # 对于普通贴图，直接复制
-                logger.info(f"处理普通贴图: {texture_path}")
-
-                # 提取相对路径 - 保持原始目录结构
-                tex_path_parts = texture_path.replace('\\', '/').split('/')
-
-                # 处理不同类型的路径
-                if 'filmserver' in tex_path_parts:
-                    # 如果路径包含filmserver，以filmserver后的部分作为相对路径
-                    tex_server_index = tex_path_parts.index('filmserver')
-                    if tex_server_index + 1 < len(tex_path_parts):
-                        tex_relative_path = '/'.join(tex_path_parts[tex_server_index+1:])
-                    else:
-                        tex_relative_path = os.path.basename(texture_path)
-                    logger.info(f"从filmserver路径提取普通贴图路径: {texture_path} -> {tex_relative_path}")
-                else:
-                    # 尝试多种方法来确定合适的相对路径
-                    source_dir = os.path.dirname(source_file).replace('\\', '/')
-                    tex_dir = os.path.dirname(texture_path).replace('\\', '/')
-
-                    # 方法1: 如果贴图文件在源文件的子目录中，保持相对结构
-                    if tex_dir.startswith(source_dir):
-                        tex_relative_path = texture_path.replace(source_dir, '').lstrip('/')
-                        logger.info(f"使用源文件子目录相对路径(普通贴图): {texture_path} -> {tex_relative_path}")
-                    else:
-                        # 方法2: 查找关键目录标识符
-                        key_folders = ['texture', 'textures', 'tex', 'maps', 'images', 'txt', 'publish', 'USD', 'usd', 'assets']
-                        found_key_folder = False
-
-                        tex_dir_parts = tex_dir.split('/')
-                        for key_folder in key_folders:
-                            if key_folder in tex_dir_parts:
-                                # 从关键文件夹开始保留路径结构
-                                key_index = tex_dir_parts.index(key_folder)
-                                tex_relative_path = '/'.join(tex_dir_parts[key_index:] + [os.path.basename(texture_path)])
-                                logger.info(f"使用关键目录标识符相对路径(普通贴图): {texture_path} -> {tex_relative_path}")
-                                found_key_folder = True
-                                break
-
-                        # 方法3: 如果前两种方法都不适用，使用父目录+文件名
-                        if not found_key_folder:
-                            parent_dir = os.path.basename(os.path.dirname(texture_path))
-                            tex_relative_path = os.path.join(parent_dir, os.path.basename(texture_path))
-                            logger.info(f"使用父目录+文件名相对路径(普通贴图): {texture_path} -> {tex_relative_path}")
+                logger.info("处理普通贴图: %s", texture_path)
+                tex_relative_path = _texture_relative_path(texture_path, source_dir_norm, dir_info_cache)
 
                 # 创建目标贴图文件路径
-                tex_target_file = os.path.join(output_path, tex_relative_path)
+                tex_target_file = f"{output_prefix}/{tex_relative_path}"
                 tex_target_dir = os.path.dirname(tex_target_file)
 
-                # 确保目标目录存在
-                if not os.path.exists(tex_target_dir):
-                    os.makedirs(tex_target_dir, exist_ok=True)
-
-                # 复制贴图文件
-                shutil.copy2(texture_path, tex_target_file)
-                copied_textures.append({
+                # 加入复制任务，稍后统一执行；同一源文件已加入复制任务时不再重复写入相同内容，只记录去重条目
+                if not _queue_copy_job(queued_targets, texture_jobs, duplicate_textures, texture_path, tex_target_file, {
                     "source": texture_path,
                     "target": tex_target_file,
                     "type": texture_type or "texture",
                     "source_info": texture_source
-                })
-                logger.info(f"复制贴图文件: {texture_path} -> {tex_target_file}")
+                }):
+                    continue
+
+                # 确保目标目录存在
+                _ensure_dir(tex_target_dir, created_dirs)
             else:
-                logger.warning(f"贴图文件不存在: {texture_path}，跳过")
+                logger.warning("贴图文件不存在: %s，跳过", texture_path)
+
+        # 所有目标路径都已确定（每个目标只对应一个任务），在线程池中批量执行复制
+        copied_references = _run_copy_jobs(list(reference_jobs.values()), on_copied)
+        copied_textures = _run_copy_jobs(list(texture_jobs.values()), on_copied)
+
+        # 重复引用的文件只复制了一次，其条目（带deduplicated标记）在目标文件由同一来源复制成功后加入结果
+        copied_pairs = {(source_file, target_file)}
+        copied_pairs.update((record["source"], record["target"]) for record in copied_references + copied_textures)
+        for copied, duplicates in ((copied_references, duplicate_references), (copied_textures, duplicate_textures)):
+            for record in duplicates:
+                if (record["source"], record["target"]) in copied_pairs:
+                    copied.append(record)
+                    if on_copied:
+                        on_copied(record)
 
         # 返回打包结果
         return {
@@ -803,10 +1013,43 @@ async def package_files(request: PackageRequest):
             }
         }
     except Exception as e:
-        logger.error(f"打包文件失败: {str(e)}")
+        logger.error("打包文件失败: %s", str(e))
         logger.error(traceback.format_exc())
         return {"success": False, "message": f"打包文件失败: {str(e)}"}
 
+@app.post("/package")
+async def package_files(request: PackageRequest):
+    """将分析出的USD文件和贴图打包到指定路径"""
+    # 打包过程中的路径检查、目录扫描和文件复制都是阻塞操作，整体放到线程池中执行，避免阻塞事件循环
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, _do_package, request)
+
+@app.post("/package_stream")
+async def package_files_stream(request: PackageRequest):
+    """与/package相同，但以NDJSON流的形式返回进度：每复制完成一个文件输出一行，最后一行为打包结果摘要"""
+    loop = asyncio.get_running_loop()
+    progress = asyncio.Queue()
+
+    def on_copied(record):
+        loop.call_soon_threadsafe(progress.put_nowait, record)
+
+    def run_package():
+        result = _do_package(request, on_copied)
+        # 摘要中不再重复包含已逐行输出的文件列表
+        summary = {"done": True, "success": result["success"], "message": result["message"]}
+        loop.call_soon_threadsafe(progress.put_nowait, summary)
+
+    async def stream():
+        worker = loop.run_in_executor(None, run_package)
+        while True:
+            item = await progress.get()
+            yield json.dumps(item, ensure_ascii=False) + "\n"
+            if item.get("done"):
+                break
+        await worker
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
 if __name__ == "__main__":
     import uvicorn
     import os
@@ -828,62 +1071,124 @@ if __name__ == "__main__":
             if port not in ports_to_try:
                 ports_to_try.insert(0, port)
         except ValueError:
-            logger.warning(f"Invalid PORT environment variable value: {env_port}, will use default port")
+            logger.warning("Invalid PORT environment variable value: %s, will use default port", env_port)
+
+    # psutil为可选依赖，安装后可直接查询端口占用，无需启动netstat/taskkill子进程
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+
+    # 使用psutil终止监听指定端口的进程，等待其退出后立即返回
+    def kill_process_on_port_psutil(port):
+        procs = []
+        for conn in psutil.net_connections(kind='inet'):
+            if conn.laddr and conn.laddr.port == port and conn.status == psutil.CONN_LISTEN and conn.pid:
+                try:
+                    proc = psutil.Process(conn.pid)
+                    logger.info("Attempting to terminate process using port %s (PID: %s)", port, conn.pid)
+                    proc.terminate()
+                    procs.append(proc)
+                except psutil.NoSuchProcess:
+                    continue
+        if not procs:
+            return False
+        _, alive = psutil.wait_procs(procs, timeout=3)
+        for proc in alive:
+            proc.kill()
+        return True
 
     # 在Windows上尝试终止占用端口的进程
+    # 其他系统上占用端口的可能是无关的服务，不终止任何进程，直接尝试下一个端口
     def kill_process_on_port(port):
-        if os.name == 'nt':  # Windows
+        if os.name != 'nt':
+            return False
+        if psutil is not None:
             try:
-                # 使用netstat查找占用端口的进程PID
-                cmd = f'netstat -ano | findstr :{port}'
-                output = subprocess.check_output(cmd, shell=True).decode('utf-8')
-
-                if output:
-                    # 提取PID
-                    for line in output.split('\n'):
-                        if f':{port}' in line:
-                            parts = line.strip().split()
-                            if len(parts) >= 5:
-                                pid = parts[4]
-                                # Terminate process
-                                logger.info(f"Attempting to terminate process using port {port} (PID: {pid})")
-                                subprocess.call(f'taskkill /F /PID {pid}', shell=True)
-                                time.sleep(1)  # Wait for process to terminate
-                                return True
+                return kill_process_on_port_psutil(port)
             except Exception as e:
-                logger.error(f"Error terminating process using port {port}: {str(e)}")
+                logger.error("Error terminating process using port %s: %s", port, str(e))
+                return False
+        try:
+            # 使用netstat查找占用端口的进程PID
+            cmd = f'netstat -ano | findstr :{port}'
+            output = subprocess.check_output(cmd, shell=True).decode('utf-8')
+
+            if output:
+                # 提取PID
+                for line in output.split('\n'):
+                    if f':{port}' in line:
+                        parts = line.strip().split()
+                        if len(parts) >= 5:
+                            pid = parts[4]
+                            # Terminate process
+                            logger.info("Attempting to terminate process using port %s (PID: %s)", port, pid)
+                            subprocess.call(f'taskkill /F /PID {pid}', shell=True)
+                            time.sleep(1)  # Wait for process to terminate
+                            return True
+        except Exception as e:
+            logger.error("Error terminating process using port %s: %s", port, str(e))
         return False
 
-    # 检查端口是否可用
-    def is_port_available(port):
+    # 绑定端口，成功时返回已绑定的socket，端口被占用时返回None
+    # 绑定好的socket直接交给uvicorn使用，避免检查端口和uvicorn自身绑定之间端口再次被占用
+    def bind_port(port):
         sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        # 与uvicorn监听时的行为保持一致，避免TIME_WAIT状态的端口被误判为占用
+        # （Windows上SO_REUSEADDR允许抢占正在监听的端口，因此只在非Windows系统上设置）
+        if os.name != 'nt':
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         try:
             sock.bind(("127.0.0.1", port))
-            return True
+            return sock
         except OSError:
-            return False
-        finally:
             sock.close()
+            return None
+
+    # 工作进程数，默认单进程，可通过环境变量 WEB_CONCURRENCY 显式启用多个工作进程
+    # （uvicorn在安装了uvloop/httptools时会自动使用它们）
+    default_workers = 1
+    try:
+        workers = max(1, int(os.environ.get("WEB_CONCURRENCY", default_workers)))
+    except ValueError:
+        logger.warning("Invalid WEB_CONCURRENCY environment variable value, using %s worker(s)", default_workers)
+        workers = default_workers
+    # Windows上uvicorn的多进程模式不支持通过fd共享已绑定的socket，始终使用单进程
+    if os.name == 'nt' and workers > 1:
+        logger.warning("WEB_CONCURRENCY=%s is not supported on Windows, using 1 worker", workers)
+        workers = 1
 
     # Try to start server on different ports
     for port in ports_to_try:
-        if not is_port_available(port):
-            logger.warning(f"Port {port} is already in use, trying to release...")
+        sock = bind_port(port)
+        if sock is None:
+            logger.warning("Port %s is already in use, trying to release...", port)
             if kill_process_on_port(port):
-                logger.info(f"Successfully released port {port}")
-                time.sleep(1)  # Wait for port to be released
-            else:
-                logger.warning(f"Unable to release port {port}, trying next port")
+                logger.info("Successfully released port %s", port)
+                if psutil is None:
+                    time.sleep(1)  # Wait for port to be released
+                sock = bind_port(port)
+            if sock is None:
+                logger.warning("Unable to release port %s, trying next port", port)
                 continue
 
         try:
-            logger.info(f"Attempting to start server on port {port}")
-            uvicorn.run(app, host="127.0.0.1", port=port)
+            logger.info("Attempting to start server on port %s", port)
+            if workers > 1:
+                # 多进程模式下uvicorn需要以导入字符串的形式加载应用，工作进程通过文件描述符共享已绑定的socket
+                sock.set_inheritable(True)
+                uvicorn.run("main:app", fd=sock.fileno(), workers=workers,
+                            app_dir=os.path.dirname(os.path.abspath(__file__)))
+            else:
+                server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port))
+                server.run(sockets=[sock])
             break  # If successfully started, break the loop
         except OSError as e:
-            logger.error(f"Failed to start server on port {port}: {str(e)}")
+            logger.error("Failed to start server on port %s: %s", port, str(e))
             continue  # Try next port
+        finally:
+            sock.close()
     else:
         # If all ports failed
-        logger.error(f"All ports {ports_to_try} are unavailable, server startup failed")
+        logger.error("All ports %s are unavailable, server startup failed", ports_to_try)
         sys.exit(1)
@@ -2,18 +2,250 @@ from pxr import Usd, UsdGeom, UsdShade, Sdf, Ar
 import os
 import re
 import glob
+import stat
+import fnmatch
+import mmap
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
 import logging
 import traceback
 from typing import Optional, List, Dict, Any, Set
 
-# 配置日志
+# google-re2为可选依赖，安装后用于对整个文件进行的引用扫描（DFA匹配，无回溯，适合大文件）
+try:
+    import re2 as scan_re
+except ImportError:
+    scan_re = re
+
+# 配置日志，可通过环境变量 LOG_LEVEL 调整级别
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=os.environ.get("LOG_LEVEL", "INFO").upper(),
     format='%(asctime)s - %(levelname)s - %(message)s',
     datefmt='%Y-%m-%d %H:%M:%S'
 )
 logger = logging.getLogger(__name__)
 
+# 并行预读引用文件文本时的最大线程数，可通过环境变量 ANALYZE_SCAN_THREADS 调整（值无效时记录警告并使用默认值）
+try:
+    TEXT_SCAN_MAX_WORKERS = max(1, int(os.environ.get("ANALYZE_SCAN_THREADS", 8)))
+except ValueError:
+    logger.warning("环境变量 ANALYZE_SCAN_THREADS 的值无效，使用默认线程数: %s", 8)
+    TEXT_SCAN_MAX_WORKERS = 8
+
+# 超过该大小（1 MiB）的USD文本文件通过mmap映射后扫描，避免把整个文件复制到内存中
+MMAP_MIN_SIZE = 1024 * 1024
+
+# 二进制USD文件的文件头：usdc（crate）文件和usdz压缩包，文本扫描时直接跳过
+BINARY_USD_MAGICS = (b'PXR-USDC', b'PK\x03\x04')
+BINARY_USD_HEADER_SIZE = max(len(magic) for magic in BINARY_USD_MAGICS)
+
+# 以下引用扫描模式均为bytes模式，直接匹配读取的原始文件内容，无需先将整个文件解码为str
+# 文本中以@开头的资产路径
+AT_PATH_RE = re.compile(rb'@([^@\s"\']+)')
+
+# 单次扫描USD文本中的引用：references列表、assetInfo块和@开头的路径
+# 列表和字典块整体匹配后，再从中提取其内部的@路径
+REFERENCE_SCAN_RE = scan_re.compile(
+    rb'references\s*=\s*\[(?P<list>[^\]]+)\]'    # references = [...]
+    rb'|assetInfo\s*=\s*{(?P<info>[^}]+)}'         # assetInfo = {...}
+    rb'|@(?P<path>[^@\s"\']+)'                     # @path/to/file.usd
+)
+
+# 引用列表和assetInfo中被@包围的路径
+REFERENCE_LIST_PATH_RE = re.compile(rb'@([^@]+)@')
+
+# 带贴图扩展名的路径（被@包围时作为贴图引用）
+TEXTURE_EXT_RE = re.compile(r'\.(?:jpg|jpeg|png|tif|tiff|exr|hdr|tx|tex|bmp|gif|psd|tga|iff|dpx|cin|svg)$')
+
+# 以下为USDA文件中纹理路径的属性模式，按优先级排列
+# 只匹配 @path@ 所在行中位于路径之前的部分，第二项为纹理来源名称（None表示使用捕获的属性名）
+USDA_TEXTURE_ATTR_PATTERNS = (
+    (re.compile(r'asset\s+inputs:([a-zA-Z0-9_]+)\s*=\s*$'), None),  # asset inputs:texture_name = @path@
+    (re.compile(r'asset\s+inputs:([a-zA-Z0-9_]+):file\s*=\s*$'), None),  # asset inputs:texture_name:file = @path@
+    (re.compile(r'filename\s*=\s*$'), 'filename'),  # filename = @path@
+    (re.compile(r'file\s*=\s*$'), 'file'),  # file = @path@
+    (re.compile(r'texture\s*=\s*$'), 'texture'),  # texture = @path@
+    (re.compile(r'colorMap\s*=\s*$'), 'colorMap'),  # colorMap = @path@
+    (re.compile(r'asset\s+([a-zA-Z0-9_:]+)\s*=\s*$'), None),  # 通用的 asset 属性模式
+    (re.compile(r'inputs:([a-zA-Z0-9_]+)_texture\s*=\s*$'), None),  # inputs:*_texture 模式
+    (re.compile(r'inputs:file\s*=\s*$'), 'file'),  # inputs:file 模式
+)
+
+# @ 符号之间的 UDIM 路径标记，优先级排在所有属性模式之后
+USDA_UDIM_TOKEN_RE = re.compile(r'<UDIM>|<udim>|\.####\.|\.1001\.|\.10[0-9][0-9]\.|\.udim\.|\.UDIM\.')
+
+# 与贴图相关的着色器输入名称关键词（输入名称已转为小写）
+TEXTURE_INPUT_NAME_RE = re.compile(
+    r'texture|file|map|image|tex|diffuse|albedo|normal|roughness|metallic'
+    r'|specular|emission|occlusion|height|bump|color|opacity|displacement'
+)
+
+# 遍历USD舞台时作为材质和着色器处理的prim类型名
+MATERIAL_PRIM_TYPES = frozenset({'Material'})
+SHADER_PRIM_TYPES = frozenset({'Shader'})
+
+# 以下USDA内容扫描模式均为bytes模式，只对匹配到的路径进行解码
+# 成对的 @ 符号之间的内容（可能为空，与按@切分的结果一致）
+AT_CONTENT_RE = re.compile(rb'@([^@]*)@')
+
+# 引号内带贴图扩展名的路径
+QUOTED_TEXTURE_PATH_RE = re.compile(rb'"([^"]+\.(?:jpg|jpeg|png|tif|tiff|exr|hdr|tx|tex|bmp|gif|psd|tga|iff|dpx|cin|svg))"', re.IGNORECASE)
+
+# 引号内的 UDIM 路径：标准 <UDIM>、数字格式 .####./.10xx.、文本 .udim.，或任何包含 udim 的贴图路径，合并为一次扫描
+QUOTED_UDIM_RE = re.compile(
+    rb'"([^"]*(?:<udim>|\.####\.|\.10[0-9][0-9]\.|\.udim\.)[^"]*'
+    rb'|[^"]*udim[^"]*\.(?:jpg|jpeg|png|tif|tiff|exr|hdr|tx|tex))"',
+    re.IGNORECASE,
+)
+
+# 常见的贴图定义模式，合并为一个正则一次扫描；第1组为引号内的路径，第2组为@之间的路径：
+#   file/texture:file/assetInfo:file/inputs:file/string inputs:file = "path"（均以file结尾）
+#   sourceColorFile/colorFile = "path"，inputs:filename/string inputs:filename = "path"
+#   asset inputs:file/asset inputs:filename/asset inputs:*_texture = @path@
+FILE_TEXTURE_RE = re.compile(
+    r'(?:sourceColorFile|colorFile|inputs:filename|file)\s*=\s*"([^"]+)"'
+    r'|asset\s+inputs:(?:file|filename|[a-zA-Z0-9_]+_texture)\s*=\s*@([^@]+)@'
+)
+
+# 以下为按行分析USD/MDL文本时使用的模式
+# prim定义：def "name" (
+PRIM_DEF_RE = re.compile(r'def\s+"?([^"\s]+)"?\s*\(')
+# 材质定义：def Material "name" (
+MATERIAL_DEF_RE = re.compile(r'def\s+Material\s+"?([^"\s]+)"?\s*\(')
+# 着色器定义：def Shader "name" (
+SHADER_DEF_RE = re.compile(r'def\s+Shader\s+"?([^"\s]+)"?\s*\(')
+
+# MDL中的贴图定义模式
+MDL_TEXTURE_PATTERNS = (
+    re.compile(r'texture_2d\s*"([^"]+)"'),  # texture_2d "path/to/texture.jpg"
+    re.compile(r'tex::texture_2d\s*\(\s*"([^"]+)"\s*\)'),  # tex::texture_2d("path/to/texture.jpg")
+    re.compile(r'file\s*=\s*"([^"]+)"'),  # file = "path/to/texture.jpg"
+)
+
+# @ 符号之间按扩展名识别为贴图的路径后缀
+AT_TEXTURE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.tif', '.tiff', '.exr', '.hdr')
+
+# UDIM占位符标记（.<udim>. 等写法已包含在内）
+UDIM_MARKERS = ('<UDIM>', '<udim>', '.####.')
+
+# 提取@路径时也视为UDIM序列的标记
+UDIM_SEQUENCE_MARKERS = UDIM_MARKERS + ('.1001.',)
+
+# 统计目录中贴图数量时计入的图像扩展名
+COUNTED_TEXTURE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.tif', '.tiff', '.exr', '.hdr', '.tx', '.tex')
+
+# resolve_path 识别的UDIM占位符，按顺序匹配第一个；均包含'<'或'#'，可先用这两个字符快速排除普通路径
+RESOLVE_UDIM_PATTERNS = ('<UDIM>', '<udim>', '.####.', '.<UDIM>.', '.<udim>.')
+
+# is_likely_texture_path 使用的判断条件
+# 贴图文件扩展名
+TEXTURE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.tif', '.tiff', '.exr', '.hdr', '.tx', '.tex',
+                      '.bmp', '.gif', '.psd', '.tga', '.iff', '.dpx', '.cin', '.svg')
+# UDIM占位符（注意大小写）
+TEXTURE_UDIM_HINTS = ('<UDIM>', '<udim>', '.####.', '.<udim>.', '.<UDIM>.', '1001.', '10[0-9][0-9]')
+# 贴图相关的关键词
+TEXTURE_KEYWORDS = ('texture', 'map', 'image', 'tex', 'diffuse', 'albedo', 'normal', 'roughness', 'metallic',
+                    'specular', 'emission', 'occlusion', 'height', 'bump', 'color', 'opacity', 'displacement')
+# 常见的贴图目录名称（作为完整的路径段匹配）
+TEXTURE_DIR_SEGMENTS = tuple(f"/{keyword}/" for keyword in ('texture', 'textures', 'tex', 'maps', 'images', 'txt', 'publish'))
+
+# is_likely_usd_path 使用的判断条件
+# USD文件扩展名
+USD_EXTENSIONS = ('.usd', '.usda', '.usdc', '.usdz')
+# 常见的USD路径目录
+USD_PATH_SEGMENTS = ('/usd/', '/assets/', '/publish/', '/model/', '/lookdev/', '/animation/')
+
+@contextlib.contextmanager
+def _open_text_bytes(file_path):
+    """以bytes打开文本文件，超过MMAP_MIN_SIZE的文件通过mmap映射，避免整体读入内存并解码为str"""
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size >= MMAP_MIN_SIZE:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                yield content
+        else:
+            yield f.read()
+
+def _iter_at_tokens(content):
+    """按顺序成对切分@符号，依次返回(开头@的位置, @之间的bytes内容)，跳过空的@@；bytes使用split切分，mmap使用正则"""
+    if isinstance(content, bytes):
+        parts = content.split(b'@')
+        pos = len(parts[0])
+        # 最后一段之前没有成对的@，不作为路径
+        for i in range(1, len(parts) - 1, 2):
+            token = parts[i]
+            if token:
+                yield pos, token
+            pos += len(token) + len(parts[i + 1]) + 2
+    else:
+        for match in AT_CONTENT_RE.finditer(content):
+            if match.end() - match.start() > 2:
+                yield match.start(), match.group(1)
+
+def _iter_file_texture_paths(text):
+    """按出现顺序返回text中所有匹配常见贴图定义模式的路径"""
+    for match in FILE_TEXTURE_RE.finditer(text):
+        yield match.group(1) or match.group(2)
+
+def _scan_text_references(file_path):
+    """扫描USD文本文件，返回(@路径列表, 引用列表/assetInfo中的路径列表, 贴图路径列表, 成对@之间的内容列表)；二进制USD文件返回空列表；不修改任何分析器状态，可在线程中并行执行"""
+    at_paths = []
+    list_paths = []
+    texture_paths = []
+    at_tokens = []
+    # 以bytes读取，只对匹配到的路径进行解码；大文件使用mmap映射（re2需要bytes对象，因此仅在使用re时映射）
+    with open(file_path, 'rb') as f:
+        # 如果是二进制USD文件（或空文件），只读取文件头判断后直接返回空列表，不读取整个文件
+        header = f.read(BINARY_USD_HEADER_SIZE)
+        if not header or header[:1] == b'\x00' or header.startswith(BINARY_USD_MAGICS):
+            return at_paths, list_paths, texture_paths, at_tokens
+        f.seek(0)
+        
+        use_mmap = scan_re is re and os.fstat(f.fileno()).st_size >= MMAP_MIN_SIZE
+        content = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if use_mmap else f.read()
+        try:
+            # 单次扫描文件内容，分别收集@路径、列表/assetInfo中的路径和贴图路径
+            for match in REFERENCE_SCAN_RE.finditer(content):
+                block = match.group('list') or match.group('info')
+                if block is None:
+                    found = [(match.group('path'), match.end(), content)]
+                else:
+                    # 列表中的路径同时也是@路径
+                    list_paths.extend(path.decode('utf-8', 'ignore') for path in REFERENCE_LIST_PATH_RE.findall(block))
+                    found = [(m.group(1), m.end(), block) for m in AT_PATH_RE.finditer(block)]
+                for path, end, text in found:
+                    path = path.decode('utf-8', 'ignore')
+                    at_paths.append(path)
+                    # 以@结尾且带贴图扩展名的路径是贴图引用
+                    if text[end:end + 1] == b'@' and TEXTURE_EXT_RE.search(path):
+                        texture_paths.append(path)
+            
+            # 同时提取成对@之间的内容，供USDA文件的@路径处理使用，避免再次读取文件
+            at_tokens = [path.decode('utf-8', 'ignore') for _, path in _iter_at_tokens(content)]
+        finally:
+            if use_mmap:
+                content.close()
+    return at_paths, list_paths, texture_paths, at_tokens
+
+def _find_file_in_tree(root, file_name, udim_prefix=None):
+    """按与os.walk相同的自上而下顺序在目录树中查找文件，找到第一个匹配的文件立即返回；目录不存在时返回None"""
+    subdirs = []
+    try:
+        with os.scandir(root) as it:
+            for entry in it:
+                if entry.is_dir():
+                    # 与os.walk默认行为一致，不进入符号链接目录
+                    if not entry.is_symlink():
+                        subdirs.append(entry.path)
+                elif entry.name == file_name or (udim_prefix is not None and entry.name.startswith(udim_prefix)):
+                    return entry.path
+    except OSError:
+        return None
+    for subdir in subdirs:
+        found_path = _find_file_in_tree(subdir, file_name, udim_prefix)
+        if found_path:
+            return found_path
+    return None
+
 class EnhancedUsdAnalyzer:
     def __init__(self):
         """初始化分析器"""
@@ -27,6 +259,24 @@ class EnhancedUsdAnalyzer:
         self.references = []
         # 存储UDIM贴图序列的贴图数量
         self.texture_udim_counts = {}
+        # 路径解析结果缓存，键为(file_path, base_dir)，每次分析时重置
+        self._resolve_cache = {}
+        # os.path.normpath结果缓存，用于去重比较时避免重复规范化同一路径，每次分析时重置
+        self._normpath_cache = {}
+        # 去重比较用路径键的缓存，键为原始路径，每次分析时重置
+        self._path_key_cache = {}
+        # is_likely_texture_path判断结果缓存，键为原始路径，每次分析时重置
+        self._likely_texture_cache = {}
+        # 提取过程中发现的引用，键为解析后的规范化路径，值为(引用路径, 类型, 添加时解析出的路径)，按插入顺序保存并用于O(1)去重
+        self._references_map = {}
+        # os.stat结果缓存（路径不存在时为None），供存在性/文件/目录检查共用，每次分析时重置
+        self._path_stat_cache = {}
+        # 目录列表缓存，键为目录路径，值为(文件名列表, 文件名集合)，每次分析时重置
+        self._listdir_cache = {}
+        # 并行预读的文本引用扫描结果，键为文件路径，使用后即移除
+        self._text_scan_cache = {}
+        # 文本引用扫描时一并提取的成对@之间的内容，键为文件路径，供USDA的@路径处理使用后即移除
+        self._at_token_cache = {}
     
     def reset(self):
         """重置分析器状态"""
@@ -34,18 +284,115 @@ class EnhancedUsdAnalyzer:
         self.texture_files = {}  # 改为字典，存储贴图路径及其来源
         self.referenced_usd_files = set()
         self.references = []
+        self._references_map = {}
         self.texture_udim_counts = {}  # 存储UDIM贴图序列的贴图数量
+        self._resolve_cache = {}
+        self._normpath_cache = {}
+        self._path_key_cache = {}
+        self._likely_texture_cache = {}
+        self._path_stat_cache = {}
+        self._listdir_cache = {}
+        self._text_scan_cache = {}
+        self._at_token_cache = {}
+    
+    def _stat(self, path):
+        """执行并缓存一次os.stat，同一路径的存在性、文件和目录检查只访问文件系统一次；路径不存在或无法访问时返回None"""
+        if path not in self._path_stat_cache:
+            try:
+                self._path_stat_cache[path] = os.stat(path)
+            except (OSError, ValueError):
+                self._path_stat_cache[path] = None
+        return self._path_stat_cache[path]
+    
+    def _exists(self, path):
+        """带缓存的os.path.exists"""
+        return self._stat(path) is not None
+    
+    def _isdir(self, path):
+        """带缓存的os.path.isdir"""
+        st = self._stat(path)
+        return st is not None and stat.S_ISDIR(st.st_mode)
+    
+    def _isfile(self, path):
+        """带缓存的os.path.isfile"""
+        st = self._stat(path)
+        return st is not None and stat.S_ISREG(st.st_mode)
+    
+    def _listdir_entry(self, dir_path):
+        """列出并缓存目录内容，同一次分析中每个目录只列出一次；列出失败时抛出的异常不缓存"""
+        entry = self._listdir_cache.get(dir_path)
+        if entry is None:
+            names = os.listdir(dir_path)
+            entry = self._listdir_cache[dir_path] = (names, set(names))
+        return entry
+    
+    def _listdir(self, dir_path):
+        """带缓存的os.listdir"""
+        return self._listdir_entry(dir_path)[0]
+    
+    def _glob(self, pattern):
+        """基于目录列表缓存的glob.glob，只在文件名部分含通配符时使用缓存，否则回退到glob.glob"""
+        dir_path, name_pattern = os.path.split(pattern)
+        if any(c in dir_path for c in '*?['):
+            return glob.glob(pattern)
+        try:
+            names = self._listdir(dir_path or '.')
+        except OSError:
+            return []
+        # 与glob一致，通配符不匹配以.开头的隐藏文件
+        if not name_pattern.startswith('.'):
+            names = [name for name in names if not name.startswith('.')]
+        return [os.path.join(dir_path, name) for name in fnmatch.filter(names, name_pattern)]
+    
+    def _file_listed(self, path):
+        """通过所在目录的列表缓存判断文件是否存在；不在列表中时回退到os.path.exists（兼容不区分大小写的文件系统）"""
+        dir_path, file_name = os.path.split(path)
+        try:
+            if file_name in self._listdir_entry(dir_path or '.')[1]:
+                return True
+        except OSError:
+            pass
+        return self._exists(path)
+    
+    def _normpath(self, path):
+        """带缓存的os.path.normpath"""
+        if path not in self._normpath_cache:
+            self._normpath_cache[path] = os.path.normpath(path)
+        return self._normpath_cache[path]
+    
+    def _path_key(self, path):
+        """返回用于去重比较的路径键（规范化并按平台处理大小写），同一路径只计算一次"""
+        key = self._path_key_cache.get(path)
+        if key is None:
+            key = self._path_key_cache[path] = os.path.normcase(self._normpath(path))
+        return key
+    
+    def _add_reference(self, ref_path, ref_type, base_dir=None):
+        """添加引用，按解析后的规范化路径（无法解析时按原始路径）去重，并保存解析结果供最终处理使用；引用已存在时返回False"""
+        resolved_path = self.resolve_path(ref_path, base_dir)
+        key = self._path_key(resolved_path) if resolved_path else ref_path
+        if key in self._references_map:
+            return False
+        self._references_map[key] = (ref_path, ref_type, resolved_path)
+        return True
     
     def resolve_path(self, file_path, base_dir=None):
+        """解析路径，将相对路径转换为绝对路径（同一次分析中相同的参数只解析一次）"""
+        key = (file_path, base_dir)
+        if key not in self._resolve_cache:
+            self._resolve_cache[key] = self._resolve_path_uncached(file_path, base_dir)
+        return self._resolve_cache[key]
+    
+    def _resolve_path_uncached(self, file_path, base_dir=None):
         """解析路径，将相对路径转换为绝对路径"""
         if not file_path:
             return None
             
-        logger.info(f"解析路径: {file_path}, 基础目录: {base_dir}")
+        logger.debug("解析路径: %s, 基础目录: %s", file_path, base_dir)
         
         # 如果已经是绝对路径，则直接返回
         if os.path.isabs(file_path):
-            logger.info(f"已经是绝对路径: {file_path}")
+            logger.debug("已经是绝对路径: %s", file_path)
             return file_path
             
         # 清理路径，移除引号和多余的空格
@@ -54,14 +401,14 @@ class EnhancedUsdAnalyzer:
         # 处理UDIM路径
         is_udim = False
         udim_pattern = None
-        for pattern in ['<UDIM>', '<udim>', '.####.', '.<UDIM>.', '.<udim>.']:
+        for pattern in (RESOLVE_UDIM_PATTERNS if '<' in file_path or '#' in file_path else ()):
             if pattern in file_path:
                 is_udim = True
                 udim_pattern = pattern
                 # 对于UDIM路径，我们需要替换占位符以便检查文件是否存在
                 # 通常使用1001作为第一个UDIM索引
                 test_path = file_path.replace(pattern, '.1001.')
-                logger.info(f"UDIM路径: {file_path}, 测试路径: {test_path}")
+                logger.debug("UDIM路径: %s, 测试路径: %s", file_path, test_path)
                 file_path = test_path
                 break
                 
@@ -71,186 +418,133 @@ class EnhancedUsdAnalyzer:
             if file_path.startswith('../') or file_path.startswith('./'):
                 # 计算实际路径
                 full_path = os.path.normpath(os.path.join(base_dir, file_path))
-                logger.info(f"多级相对路径: {file_path} -> {full_path}")
+                logger.debug("多级相对路径: %s -> %s", file_path, full_path)
                 
                 # 检查文件是否存在
-                if os.path.exists(full_path):
-                    logger.info(f"文件存在: {full_path}")
+                if self._exists(full_path):
+                    logger.debug("文件存在: %s", full_path)
                     if is_udim:
                         # 对于UDIM贴图，我们需要恢复原始的UDIM占位符
                         original_path = full_path.replace('.1001.', udim_pattern)
-                        logger.info(f"恢复UDIM路径: {full_path} -> {original_path}")
+                        logger.debug("恢复UDIM路径: %s -> %s", full_path, original_path)
                         return original_path
                     return full_path
                 else:
-                    logger.info(f"文件不存在: {full_path}")
+                    logger.debug("文件不存在: %s", full_path)
                     
-                    # 尝试在不同的位置查找文件
-                    # 1. 检查是否有txt目录
-                    txt_dir = os.path.join(os.path.dirname(base_dir), 'txt')
-                    if os.path.exists(txt_dir):
-                        # 提取文件名
-                        file_name = os.path.basename(file_path)
-                        # 在txt目录中查找
-                        for root, dirs, files in os.walk(txt_dir):
-                            for file in files:
-                                if file == file_name or (is_udim and file.startswith(file_name.replace('.1001.', ''))):
-                                    found_path = os.path.join(root, file)
-                                    logger.info(f"在txt目录中找到文件: {found_path}")
-                                    if is_udim:
-                                        # 对于UDIM贴图，我们需要恢复原始的UDIM占位符
-                                        dir_name = os.path.dirname(found_path)
-                                        base_name = os.path.basename(file_path).replace('.1001.', '')
-                                        original_path = os.path.join(dir_name, base_name.replace('.', udim_pattern + '.'))
-                                        logger.info(f"恢复UDIM路径: {found_path} -> {original_path}")
-                                        return original_path
-                                    return found_path
-                    
-                    # 2. 尝试在publish目录中查找
-                    publish_dir = os.path.join(os.path.dirname(base_dir), 'publish')
-                    if os.path.exists(publish_dir):
-                        # 提取文件名
-                        file_name = os.path.basename(file_path)
-                        # 在publish目录中查找
-                        for root, dirs, files in os.walk(publish_dir):
-                            for file in files:
-                                if file == file_name or (is_udim and file.startswith(file_name.replace('.1001.', ''))):
-                                    found_path = os.path.join(root, file)
-                                    logger.info(f"在publish目录中找到文件: {found_path}")
-                                    if is_udim:
-                                        # 对于UDIM贴图，我们需要恢复原始的UDIM占位符
-                                        dir_name = os.path.dirname(found_path)
-                                        base_name = os.path.basename(file_path).replace('.1001.', '')
-                                        original_path = os.path.join(dir_name, base_name.replace('.', udim_pattern + '.'))
-                                        logger.info(f"恢复UDIM路径: {found_path} -> {original_path}")
-                                        return original_path
-                                    return found_path
+                    # 尝试在不同的位置查找文件（txt目录和publish目录）
+                    found_path = self.find_in_fallback_dirs(base_dir, file_path, is_udim, udim_pattern)
+                    if found_path:
+                        return found_path
                     
                     # 如果文件不存在，则尝试返回原始路径
                     if is_udim:
                         # 对于UDIM贴图，我们需要恢复原始的UDIM占位符
                         original_path = full_path.replace('.1001.', udim_pattern)
-                        logger.info(f"文件不存在，返回原始UDIM路径: {original_path}")
+                        logger.debug("文件不存在，返回原始UDIM路径: %s", original_path)
                         return original_path
                     
-                    logger.info(f"文件不存在，返回原始路径: {full_path}")
+                    logger.debug("文件不存在，返回原始路径: %s", full_path)
                     return full_path
             else:
                 # 处理简单的相对路径，如 textures/file.jpg
                 full_path = os.path.normpath(os.path.join(base_dir, file_path))
-                logger.info(f"简单相对路径: {file_path} -> {full_path}")
+                logger.debug("简单相对路径: %s -> %s", file_path, full_path)
                 
                 # 检查文件是否存在
-                if os.path.exists(full_path):
-                    logger.info(f"文件存在: {full_path}")
+                if self._exists(full_path):
+                    logger.debug("文件存在: %s", full_path)
                     if is_udim:
                         # 对于UDIM贴图，我们需要恢复原始的UDIM占位符
                         original_path = full_path.replace('.1001.', udim_pattern)
-                        logger.info(f"恢复UDIM路径: {full_path} -> {original_path}")
+                        logger.debug("恢复UDIM路径: %s -> %s", full_path, original_path)
                         return original_path
                     return full_path
                 else:
-                    logger.info(f"文件不存在: {full_path}")
-                    
-                    # 尝试在不同的位置查找文件
-                    # 1. 检查是否有txt目录
-                    txt_dir = os.path.join(os.path.dirname(base_dir), 'txt')
-                    if os.path.exists(txt_dir):
-                        # 提取文件名
-                        file_name = os.path.basename(file_path)
-                        # 在txt目录中查找
-                        for root, dirs, files in os.walk(txt_dir):
-                            for file in files:
-                                if file == file_name or (is_udim and file.startswith(file_name.replace('.1001.', ''))):
-                                    found_path = os.path.join(root, file)
-                                    logger.info(f"在txt目录中找到文件: {found_path}")
-                                    if is_udim:
-                                        # 对于UDIM贴图，我们需要恢复原始的UDIM占位符
-                                        dir_name = os.path.dirname(found_path)
-                                        base_name = os.path.basename(file_path).replace('.1001.', '')
-                                        original_path = os.path.join(dir_name, base_name.replace('.', udim_pattern + '.'))
-                                        logger.info(f"恢复UDIM路径: {found_path} -> {original_path}")
-                                        return original_path
-                                    return found_path
+                    logger.debug("文件不存在: %s", full_path)
                     
-                    # 2. 尝试在publish目录中查找
-                    publish_dir = os.path.join(os.path.dirname(base_dir), 'publish')
-                    if os.path.exists(publish_dir):
-                        # 提取文件名
-                        file_name = os.path.basename(file_path)
-                        # 在publish目录中查找
-                        for root, dirs, files in os.walk(publish_dir):
-                            for file in files:
-                                if file == file_name or (is_udim and file.startswith(file_name.replace('.1001.', ''))):
-                                    found_path = os.path.join(root, file)
-                                    logger.info(f"在publish目录中找到文件: {found_path}")
-                                    if is_udim:
-                                        # 对于UDIM贴图，我们需要恢复原始的UDIM占位符
-                                        dir_name = os.path.dirname(found_path)
-                                        base_name = os.path.basename(file_path).replace('.1001.', '')
-                                        original_path = os.path.join(dir_name, base_name.replace('.', udim_pattern + '.'))
-                                        logger.info(f"恢复UDIM路径: {found_path} -> {original_path}")
-                                        return original_path
-                                    return found_path
+                    # 尝试在不同的位置查找文件（txt目录和publish目录）
+                    found_path = self.find_in_fallback_dirs(base_dir, file_path, is_udim, udim_pattern)
+                    if found_path:
+                        return found_path
                     
                     # 如果文件不存在，则尝试返回原始路径
                     if is_udim:
                         # 对于UDIM贴图，我们需要恢复原始的UDIM占位符
                         original_path = full_path.replace('.1001.', udim_pattern)
-                        logger.info(f"文件不存在，返回原始UDIM路径: {original_path}")
+                        logger.debug("文件不存在，返回原始UDIM路径: %s", original_path)
                         return original_path
                     
-                    logger.info(f"文件不存在，返回原始路径: {full_path}")
+                    logger.debug("文件不存在，返回原始路径: %s", full_path)
                     return full_path
         
         # 如果没有提供基础目录，则尝试在当前工作目录中查找
         full_path = os.path.normpath(os.path.join(os.getcwd(), file_path))
-        logger.info(f"使用当前工作目录: {file_path} -> {full_path}")
+        logger.debug("使用当前工作目录: %s -> %s", file_path, full_path)
         
         # 检查文件是否存在
-        if os.path.exists(full_path):
-            logger.info(f"文件存在: {full_path}")
+        if self._exists(full_path):
+            logger.debug("文件存在: %s", full_path)
             if is_udim:
                 # 对于UDIM贴图，我们需要恢复原始的UDIM占位符
                 original_path = full_path.replace('.1001.', udim_pattern)
-                logger.info(f"恢复UDIM路径: {full_path} -> {original_path}")
+                logger.debug("恢复UDIM路径: %s -> %s", full_path, original_path)
                 return original_path
             return full_path
         else:
-            logger.info(f"文件不存在: {full_path}")
+            logger.debug("文件不存在: %s", full_path)
             
             # 如果文件不存在，则尝试返回原始路径
             if is_udim:
                 # 对于UDIM贴图，我们需要恢复原始的UDIM占位符
                 original_path = full_path.replace('.1001.', udim_pattern)
-                logger.info(f"文件不存在，返回原始UDIM路径: {original_path}")
+                logger.debug("文件不存在，返回原始UDIM路径: %s", original_path)
                 return original_path
             
-            logger.info(f"文件不存在，返回原始路径: {full_path}")
+            logger.debug("文件不存在，返回原始路径: %s", full_path)
             return full_path
     
+    def find_in_fallback_dirs(self, base_dir, file_path, is_udim=False, udim_pattern=None):
+        """在基础目录同级的txt和publish目录中按文件名查找文件，未找到时返回None"""
+        file_name = os.path.basename(file_path)
+        udim_prefix = file_name.replace('.1001.', '') if is_udim else None
+        for folder in ('txt', 'publish'):
+            search_dir = os.path.join(os.path.dirname(base_dir), folder)
+            found_path = _find_file_in_tree(search_dir, file_name, udim_prefix)
+            if not found_path:
+                continue
+            logger.debug("在%s目录中找到文件: %s", folder, found_path)
+            if is_udim:
+                # 对于UDIM贴图，我们需要恢复原始的UDIM占位符
+                dir_name = os.path.dirname(found_path)
+                original_path = os.path.join(dir_name, udim_prefix.replace('.', udim_pattern + '.'))
+                logger.debug("恢复UDIM路径: %s -> %s", found_path, original_path)
+                return original_path
+            return found_path
+        return None
+    
     def normalize_path(self, path):
         """规范化路径，处理大小写和路径分隔符"""
         if not path:
             return None
             
-        logger.info(f"正在规范化路径: {path}")
+        logger.debug("正在规范化路径: %s", path)
         
         # 规范化路径
-        norm_path = os.path.normpath(path).replace('\\', '/')
+        norm_path = self._normpath(path).replace('\\', '/')
         
         # 处理Windows盘符，确保使用大写
         if len(norm_path) > 1 and norm_path[1] == ':':
             drive = norm_path[0].upper()
             rest_path = norm_path[2:]
             norm_path = f"{drive}:{rest_path}"
-            logger.info(f"处理Windows盘符: {path} -> {norm_path}")
+            logger.debug("处理Windows盘符: %s -> %s", path, norm_path)
             
         # 保留原始目录结构，包括aa/USD/
         # 注意：我们不再移除aa/USD/部分，因为这可能导致路径识别错误
         # 只进行基本的路径规范化，保留原始目录结构
         
-        logger.info(f"规范化后的路径: {path} -> {norm_path}")
+        logger.debug("规范化后的路径: %s -> %s", path, norm_path)
         return norm_path
     
     def extract_references_from_text(self, file_path):
@@ -258,59 +552,26 @@ class EnhancedUsdAnalyzer:
         references = []
         
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                
-            # 如果是二进制USD文件，直接返回空列表
-            if not content or content.startswith(b'\x00') if isinstance(content, bytes) else content.startswith('\x00'):
-                return references
-        
+            # 优先使用并行预读的扫描结果
+            scanned = self._text_scan_cache.pop(file_path, None)
+            at_paths, list_paths, texture_paths, at_tokens = scanned if scanned is not None else _scan_text_references(file_path)
+            if os.path.splitext(file_path)[1].lower() == '.usda':
+                self._at_token_cache[file_path] = at_tokens
+            
             # 提取@开头的引用
-            pattern = r'@([^@\s"\']+)'
-            matches = re.findall(pattern, content)
-            for path in matches:
+            for path in at_paths:
                 # 过滤掉不像是文件路径的内容
                 if self.is_likely_usd_path(path) and not self.is_likely_texture_path(path):
                     references.append(path)
             
-            # 提取引号中的引用
-            patterns = [
-                r'(?:prepend\s+references\s*=\s*@)([^@\s"\']+)(?:@)',  # prepend references = @path/to/texture.jpg@
-                r'(?:append\s+references\s*=\s*@)([^@\s"\']+)(?:@)',   # append references = @path/to/texture.jpg@
-                r'(?:references\s*=\s*@)([^@\s"\']+)(?:@)',            # references = @path/to/texture.jpg@
-                r'(?:references\s*=\s*\[)([^\]]+)(?:\])',              # references = [...]
-                r'(?:add\s+references\s*=\s*@)([^@\s"\']+)(?:@)',      # add references = @path/to/texture.jpg@
-                r'(?:add\s+reference\s*=\s*@)([^@\s"\']+)(?:@)',       # add reference = @path/to/texture.jpg@
-                r'(?:reference\s*=\s*@)([^@\s"\']+)(?:@)',             # reference = @path/to/texture.jpg@
-                r'(?:assetInfo\s*=\s*{)([^}]+)(?:})',                  # assetInfo = {...}
-                r'(?:payload\s*=\s*@)([^@\s"\']+)(?:@)',               # payload = @path/to/texture.jpg@
-            ]
-            
-            for pattern in patterns:
-                matches = re.findall(pattern, content)
-                for match in matches:
-                    if '[' in pattern:  # 处理引用列表
-                        # 分割并清理引用列表中的路径
-                        paths = re.findall(r'@([^@]+)@', match)
-                        for path in paths:
-                            path = path.strip()
-                            if path and self.is_likely_usd_path(path) and not self.is_likely_texture_path(path):
-                                references.append(path)
-                    elif '{' in pattern:  # 处理assetInfo
-                        # 提取assetInfo中的identifier
-                        identifiers = re.findall(r'identifier\s*=\s*@([^@]+)@', match)
-                        for identifier in identifiers:
-                            if identifier and self.is_likely_usd_path(identifier) and not self.is_likely_texture_path(identifier):
-                                references.append(identifier)
-                    else:
-                        # 直接添加匹配的路径
-                        if match and self.is_likely_usd_path(match) and not self.is_likely_texture_path(match):
-                            references.append(match)
+            # 提取引用列表和assetInfo中的引用
+            for path in list_paths:
+                path = path.strip()
+                if path and self.is_likely_usd_path(path) and not self.is_likely_texture_path(path):
+                    references.append(path)
                             
             # 同时将找到的贴图路径添加到纹理列表中
-            texture_pattern = r'@([^@\s"\']+\.(?:jpg|jpeg|png|tif|tiff|exr|hdr|tx|tex|bmp|gif|psd|tga|iff|dpx|cin|svg))@'
-            texture_matches = re.findall(texture_pattern, content)
-            for path in texture_matches:
+            for path in texture_paths:
                 if self.is_likely_texture_path(path):
                     # 获取当前USD文件名作为来源
                     usd_file_name = os.path.basename(file_path)
@@ -318,11 +579,28 @@ class EnhancedUsdAnalyzer:
                     if resolved_path:
                         self.add_texture_path(resolved_path, f"{usd_file_name}:texture_reference")
         except Exception as e:
-            logger.error(f"从文件 {file_path} 中提取引用时出错: {str(e)}")
+            logger.error("从文件 %s 中提取引用时出错: %s", file_path, str(e))
             logger.error(traceback.format_exc())
         
         return references
     
+    def _prefetch_text_scans(self, file_paths):
+        """在线程池中并行读取并扫描即将递归处理的USD文本文件，结果缓存后由extract_references_from_text依次使用"""
+        pending = [path for path in dict.fromkeys(file_paths)
+                   if path not in self._text_scan_cache
+                   and self._path_key(path) not in self.processed_assets]
+        if len(pending) < 2:
+            return
+        
+        with ThreadPoolExecutor(max_workers=min(TEXT_SCAN_MAX_WORKERS, len(pending))) as executor:
+            futures = [executor.submit(_scan_text_references, path) for path in pending]
+            for path, future in zip(pending, futures):
+                try:
+                    self._text_scan_cache[path] = future.result()
+                except Exception:
+                    # 预读失败的文件在递归处理时重新读取，并按原有逻辑记录错误
+                    pass
+    
     def resolve_udim_sequence(self, file_path):
         """解析UDIM贴图序列，返回所有匹配的文件"""
         if not file_path:
@@ -337,7 +615,7 @@ class EnhancedUsdAnalyzer:
 
         # 获取文件目录
         file_dir = os.path.dirname(file_path)
-        if not os.path.exists(file_dir):
+        if not self._exists(file_dir):
             return [file_path]  # 目录不存在，返回原路径
 
         # 替换UDIM模式为通配符
@@ -358,7 +636,7 @@ class EnhancedUsdAnalyzer:
         glob_pattern = re.sub(r'\[1-9\]\[0-9\]\[0-9\]\[0-9\]', '*', glob_pattern)
 
         # 使用glob查找所有匹配的文件
-        matching_files = glob.glob(glob_pattern)
+        matching_files = self._glob(glob_pattern)
 
         # 如果没有找到匹配的文件，返回原路径
         if not matching_files:
@@ -368,12 +646,13 @@ class EnhancedUsdAnalyzer:
     
     def add_texture_path(self, path, source=None):
         """添加贴图路径到集合，处理UDIM序列"""
-        if not path:
+        # 已添加过的路径保留首次记录的来源，也不必重复统计UDIM贴图
+        if not path or path in self.texture_files:
             return
 
         # 检查是否为UDIM贴图序列
         udim_count = 0
-        is_udim = any(pattern in path for pattern in ['<UDIM>', '<udim>', '.####.', '.<udim>.', '.<UDIM>.'])
+        is_udim = any(marker in path for marker in UDIM_MARKERS)
         
         if is_udim:
             # 尝试查找实际的UDIM贴图文件
@@ -381,64 +660,54 @@ class EnhancedUsdAnalyzer:
                 base_dir = os.path.dirname(path)
                 file_name = os.path.basename(path)
                 
-                # 替换UDIM占位符为正则表达式模式
+                # 替换UDIM占位符为正则表达式模式，文件名的其余部分按原样匹配
                 if '<UDIM>' in file_name or '<udim>' in file_name:
-                    pattern = file_name.replace('<UDIM>', r'\d{4}').replace('<udim>', r'\d{4}')
-                elif '.####.' in file_name:
-                    pattern = file_name.replace('.####.', r'.\d{4}.')
+                    parts, tile = re.split('<UDIM>|<udim>', file_name), r'\d{4}'
                 else:
-                    pattern = file_name
+                    parts, tile = file_name.split('.####.'), r'\.\d{4}\.'
+                pattern = re.compile(tile.join(re.escape(part) for part in parts))
                 
                 # 查找匹配的文件
-                if os.path.exists(base_dir):
-                    for file in os.listdir(base_dir):
-                        if re.match(pattern, file):
+                if self._exists(base_dir):
+                    for file in self._listdir(base_dir):
+                        if pattern.fullmatch(file):
                             udim_count += 1
                 
-                logger.info(f"找到 {udim_count} 个UDIM贴图: {path}")
+                logger.debug("找到 %s 个UDIM贴图: %s", udim_count, path)
                 # 保存UDIM贴图数量
                 self.texture_udim_counts[path] = udim_count
             except Exception as e:
-                logger.error(f"查找UDIM贴图时出错: {str(e)}")
+                logger.error("查找UDIM贴图时出错: %s", str(e))
         
-        # 如果路径不在字典中，添加它
-        if path not in self.texture_files:
-            self.texture_files[path] = source
+        self.texture_files[path] = source
     
     def is_likely_texture_path(self, path):
-        """判断路径是否可能是贴图路径"""
+        """判断路径是否可能是贴图路径（同一次分析中相同的路径只判断一次）"""
         if not path or not isinstance(path, str):
             return False
         
+        result = self._likely_texture_cache.get(path)
+        if result is None:
+            result = self._likely_texture_cache[path] = self._is_likely_texture_path_uncached(path)
+        return result
+    
+    def _is_likely_texture_path_uncached(self, path):
+        """判断路径是否可能是贴图路径"""
         # 清理路径
         path = path.strip().strip('"\'')
-        
-        # 检查文件扩展名
-        texture_extensions = [
-            '.jpg', '.jpeg', '.png', '.tif', '.tiff', '.exr', '.hdr', '.tx', '.tex',
-            '.bmp', '.gif', '.psd', '.tga', '.iff', '.dpx', '.cin', '.svg'
-        ]
-        
-        # 检查是否有任何一个扩展名匹配
-        has_texture_ext = any(path.lower().endswith(ext) for ext in texture_extensions)
-        
-        # 检查是否包含UDIM占位符（注意大小写）
-        udim_patterns = ['<UDIM>', '<udim>', '.####.', '.<udim>.', '.<UDIM>.', '1001.', '10[0-9][0-9]']
-        has_udim = any(pattern in path for pattern in udim_patterns)
-        
-        # 检查路径中是否包含贴图相关的关键词
-        texture_keywords = ['texture', 'map', 'image', 'tex', 'diffuse', 'albedo', 'normal', 'roughness', 'metallic',
-                           'specular', 'emission', 'occlusion', 'height', 'bump', 'color', 'opacity', 'displacement']
-        
-        has_texture_keyword = any(keyword in path.lower() for keyword in texture_keywords)
-        
-        # 检查路径中是否包含常见的贴图目录名称
-        texture_dir_keywords = ['texture', 'textures', 'tex', 'maps', 'images', 'txt', 'publish']
-        has_texture_dir = any(f"/{keyword}/" in path.lower().replace('\\', '/') for keyword in texture_dir_keywords)
+        path_lower = path.lower()
         
         # 如果有扩展名或UDIM占位符，则认为是贴图路径
+        if path_lower.endswith(TEXTURE_EXTENSIONS) or any(pattern in path for pattern in TEXTURE_UDIM_HINTS):
+            return True
+        
         # 增加了对贴图目录的检查
-        return has_texture_ext or has_udim or has_texture_dir or (has_texture_keyword and '.' in path)
+        normalized_path = path_lower.replace('\\', '/')
+        if any(segment in normalized_path for segment in TEXTURE_DIR_SEGMENTS):
+            return True
+        
+        # 路径中包含贴图相关的关键词并且带有扩展名
+        return '.' in path and any(keyword in path_lower for keyword in TEXTURE_KEYWORDS)
     
     def is_likely_usd_path(self, path):
         """判断路径是否可能是USD文件路径
@@ -451,19 +720,15 @@ class EnhancedUsdAnalyzer:
         """
         # 去除可能的引号
         path = path.strip('"\'')
+        path_lower = path.lower()
         
-        # 检查文件扩展名
-        usd_extensions = ['.usd', '.usda', '.usdc', '.usdz']
-        has_usd_ext = any(path.lower().endswith(ext) for ext in usd_extensions)
+        # 如果有USD扩展名，则认为是USD路径
+        if path_lower.endswith(USD_EXTENSIONS):
+            return True
         
-        # 检查是否包含常见的USD路径模式
-        has_usd_pattern = any(pattern in path.lower() for pattern in ['/usd/', '/assets/', '/publish/', '/model/', '/lookdev/', '/animation/'])
-        
-        # 检查是否是相对路径或绝对路径
+        # 看起来像相对路径或绝对路径且包含USD路径模式，也认为是USD路径
         looks_like_path = ('/' in path or '\\' in path) and not path.startswith('http')
-        
-        # 如果有USD扩展名，或者看起来像路径且包含USD路径模式，则认为是USD路径
-        return has_usd_ext or (looks_like_path and has_usd_pattern)
+        return looks_like_path and any(pattern in path_lower for pattern in USD_PATH_SEGMENTS)
     
     def scan_file_for_texture_paths(self, file_path, source_name=None):
         """直接扫描文件内容寻找可能的贴图路径"""
@@ -471,352 +736,48 @@ class EnhancedUsdAnalyzer:
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
                 content = f.read()
 
-            # 查找常见的贴图定义模式
-            file_patterns = [
-                r'file\s*=\s*"([^"]+)"',  # file = "path/to/texture.jpg"
-                r'sourceColorFile\s*=\s*"([^"]+)"',  # sourceColorFile = "path/to/texture.jpg"
-                r'colorFile\s*=\s*"([^"]+)"',  # colorFile = "path/to/texture.jpg"
-                r'texture:file\s*=\s*"([^"]+)"',  # texture:file = "path/to/texture.jpg"
-                r'assetInfo:file\s*=\s*"([^"]+)"',  # assetInfo:file = "path/to/texture.jpg"
-                r'inputs:file\s*=\s*"([^"]+)"',  # inputs:file = "path/to/texture.jpg"
-                r'inputs:filename\s*=\s*"([^"]+)"',  # inputs:filename = "path/to/texture.jpg"
-                r'asset inputs:file\s*=\s*@([^@]+)@',  # asset inputs:file = @path/to/texture.jpg@
-                r'asset inputs:filename\s*=\s*@([^@]+)@',  # asset inputs:filename = @path/to/texture.jpg@
-                r'asset inputs:[a-zA-Z0-9_]+_texture\s*=\s*@([^@]+)@',  # asset inputs:basecolor_texture = @path/to/texture.jpg@
-                r'string inputs:file\s*=\s*"([^"]+)"',  # string inputs:file = "path/to/texture.jpg"
-                r'string inputs:filename\s*=\s*"([^"]+)"',  # string inputs:filename = "path/to/texture.jpg"
-            ]
-
             base_dir = os.path.dirname(file_path)
             
             # 如果没有提供来源名称，使用文件名
             if source_name is None:
                 source_name = os.path.basename(file_path)
 
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-
-            # MDL中的贴图定义模式
-            texture_patterns = [
-                r'texture_2d\s*"([^"]+)"',  # texture_2d "path/to/texture.jpg"
-                r'tex::texture_2d\s*\(\s*"([^"]+)"\s*\)',  # tex::texture_2d("path/to/texture.jpg")
-                r'file\s*=\s*"([^"]+)"',  # file = "path/to/texture.jpg"
-            ]
-
-            for pattern in texture_patterns:
-                matches = re.findall(pattern, content)
-                for match in matches:
-                    if self.is_likely_texture_path(match):
-                        resolved_path = self.resolve_path(match, base_dir)
-                        if resolved_path:
-                            self.add_texture_path(resolved_path, source_name)
-
-        except Exception as e:
-            logger.error(f"扫描文件 {file_path} 失败: {str(e)}")
-            logger.error(traceback.format_exc())
-    
-    def extract_assets_from_usd(self, usd_file_path, base_dir=None):
-        """从USD文件中提取所有资产"""
-        # 如果已经处理过这个文件，则跳过
-        abs_path = self.resolve_path(usd_file_path, base_dir)
-        if not abs_path or abs_path in self.processed_assets:
-            return
-
-        self.processed_assets.add(abs_path)
-        logger.info(f"正在处理USD文件: {abs_path}")
-
-        # 获取文件所在目录作为基础目录
-        current_dir = os.path.dirname(abs_path)
-        
-        # 如果提供了原始目录，优先使用它来解析相对路径
-        effective_dir = base_dir if base_dir else current_dir
-        logger.info(f"使用有效目录进行解析: {effective_dir}")
-        
-        # 获取当前处理的USD文件名，用作贴图来源
-        current_usd_name = os.path.basename(abs_path)
-        logger.info(f"当前处理的USD文件: {current_usd_name}")
-        
-        # 用于检查引用是否已经添加过
-        def is_reference_already_added(ref_path):
-            """检查引用是否已经添加过"""
-            resolved_ref_path = self.resolve_path(ref_path, effective_dir)
-            if not resolved_ref_path:
-                return False
-                
-            for existing_ref, _ in self.references:
-                existing_full_path = self.resolve_path(existing_ref, effective_dir)
-                if existing_full_path and os.path.normpath(existing_full_path) == os.path.normpath(resolved_ref_path):
-                    return True
-            return False
-
-        try:
-            # 检查文件是否存在
-            if not os.path.exists(abs_path):
-                logger.error(f"文件不存在: {abs_path}")
-                return
-                
-            # 检查文件扩展名
-            file_ext = os.path.splitext(abs_path)[1].lower()
-            logger.info(f"文件扩展名: {file_ext}")
-            
-            # 首先检查是否有shader文件夹，如果有，优先处理shader/main.usda
-            shader_dir = os.path.join(os.path.dirname(abs_path), 'shader')
-            has_shader_folder = os.path.exists(shader_dir) and os.path.isdir(shader_dir)
-            
-            logger.info(f"检查shader文件夹: {shader_dir}, 存在: {has_shader_folder}")
-            
-            if has_shader_folder:
-                logger.info(f"发现shader文件夹: {shader_dir}")
-                main_usda_path = os.path.join(shader_dir, 'main.usda')
-                
-                logger.info(f"检查main.usda文件: {main_usda_path}, 存在: {os.path.exists(main_usda_path)}")
-                
-                if os.path.exists(main_usda_path) and os.path.isfile(main_usda_path):
-                    logger.info(f"发现shader/main.usda文件: {main_usda_path}")
-                    
-                    # 添加到引用列表，如果不存在的话
-                    if not is_reference_already_added(main_usda_path):
-                        self.references.append((main_usda_path, "shader"))
-                    
-                    # 清空当前的纹理列表，只使用shader/main.usda中的纹理
-                    self.texture_files.clear()
-                    logger.info("已清空纹理列表，将只使用shader/main.usda中的纹理")
-                    
-                    # 直接读取main.usda文件内容并提取所有@符号之间的内容
-                    try:
-                        with open(main_usda_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            content = f.read()
-                            
-                        # 提取所有@符号之间的内容
-                        pattern = r'@([^@]+)@'
-                        matches = re.findall(pattern, content)
-                        logger.info(f"从shader/main.usda中找到 {len(matches)} 个@符号之间的内容")
-                        
-                        for path in matches:
-                            logger.info(f"@符号之间的内容: {path}")
-                            # 检查是否是贴图路径
-                            if '.' in path and any(ext in path.lower() for ext in ['.jpg', '.jpeg', '.png', '.tif', '.tiff', '.exr', '.hdr']):
-                                # 解析路径
-                                resolved_path = self.resolve_path(path, shader_dir)
-                                if resolved_path:
-                                    # 检查是否包含UDIM相关字符
-                                    if any(pattern in path for pattern in ['<UDIM>', '<udim>', '.####.', '.1001.']):
-                                        self.add_texture_path(resolved_path, "shader:UDIM")
-                                        logger.info(f"添加UDIM贴图: {resolved_path}")
-                                    else:
-                                        self.add_texture_path(resolved_path, "shader:texture")
-                                        logger.info(f"添加普通贴图: {resolved_path}")
-                            # 检查是否是USD文件引用
-                            elif '.usda' in path.lower() or '.usd' in path.lower() or '.usdz' in path.lower():
-                                # 解析路径
-                                resolved_path = self.resolve_path(path, shader_dir)
-                                if resolved_path:
-                                    logger.info(f"从@符号中发现USD引用: {path} -> {resolved_path}")
-                                    # 检查是否已经添加过这个引用
-                                    ref_already_added = False
-                                    for existing_ref, ref_type in self.references:
-                                        existing_full_path = self.resolve_path(existing_ref, shader_dir)
-                                        if existing_full_path and os.path.normpath(existing_full_path) == os.path.normpath(resolved_path):
-                                            ref_already_added = True
-                                            break
-                                    
-                                    if not ref_already_added:
-                                        # 添加到references列表
-                                        self.references.append((path, "reference"))
-                                        # 递归处理引用的USD文件
-                                        self.extract_assets_from_usd(resolved_path, shader_dir)
-                    except Exception as e:
-                        logger.error(f"处理shader/main.usda文件时出错: {str(e)}")
-                        logger.error(traceback.format_exc())
-                    
-                    # 如果找到了纹理，则直接返回，不再处理其他文件
-                    if self.texture_files:
-                        logger.info(f"从shader/main.usda中找到了 {len(self.texture_files)} 个纹理，跳过其他处理")
-                        logger.info(f"找到的纹理: {list(self.texture_files.keys())}")
-                        return
-                    else:
-                        logger.info("从shader/main.usda中没有找到纹理，将继续处理其他文件")
-            
-            # 如果没有找到shader/main.usda或者没有从中提取到纹理，则继续处理主文件
-            
-            # 1. 从文本中提取引用
-            text_references = self.extract_references_from_text(abs_path)
-            if text_references:
-                logger.info(f"从文本中发现 {len(text_references)} 个引用:")
-                for ref in text_references:
-                    logger.info(f"文本引用: {ref}")
-                    # 使用有效目录解析相对路径
-                    full_ref_path = self.resolve_path(ref, effective_dir)
-                    if full_ref_path:
-                        # 检查是否已经添加过这个引用
-                        ref_already_added = False
-                        for existing_ref, ref_type in self.references:
-                            existing_full_path = self.resolve_path(existing_ref, effective_dir)
-                            if existing_full_path and os.path.normpath(existing_full_path) == os.path.normpath(full_ref_path):
-                                ref_already_added = True
-                                break
-                        
-                        if not ref_already_added:
-                            logger.info(f"添加新引用并递归处理: {full_ref_path}")
-                            self.referenced_usd_files.add(full_ref_path)
-                            # 添加到references列表
-                            self.references.append((ref, "reference"))
-                            # 递归处理引用的USD文件
-                            self.extract_assets_from_usd(full_ref_path, effective_dir)
-            
-            # 2. 如果是USDA文件，直接从文件内容中提取@符号之间的内容
-            if file_ext == '.usda':
-                try:
-                    with open(abs_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = f.read()
-                        
-                    # 提取所有@符号之间的内容
-                    pattern = r'@([^@]+)@'
-                    matches = re.findall(pattern, content)
-                    logger.info(f"从{abs_path}中找到 {len(matches)} 个@符号之间的内容")
-                    
-                    for path in matches:
-                        logger.info(f"@符号之间的内容: {path}")
-                        # 检查是否是贴图路径
-                        if '.' in path and any(ext in path.lower() for ext in ['.jpg', '.jpeg', '.png', '.tif', '.tiff', '.exr', '.hdr']):
-                            # 解析路径
-                            resolved_path = self.resolve_path(path, effective_dir)
-                            if resolved_path:
-                                # 检查是否包含UDIM相关字符
-                                if any(pattern in path for pattern in ['<UDIM>', '<udim>', '.####.', '.1001.']):
-                                    self.add_texture_path(resolved_path, f"{current_usd_name}:UDIM")
-                                    logger.info(f"添加UDIM贴图: {resolved_path}")
-                                else:
-                                    self.add_texture_path(resolved_path, f"{current_usd_name}:texture")
-                                    logger.info(f"添加普通贴图: {resolved_path}")
-                        # 检查是否是USD文件引用
-                        elif '.usda' in path.lower() or '.usd' in path.lower() or '.usdz' in path.lower():
-                            # 解析路径
-                            resolved_path = self.resolve_path(path, effective_dir)
-                            if resolved_path:
-                                logger.info(f"从@符号中发现USD引用: {path} -> {resolved_path}")
-                                # 检查是否已经添加过这个引用
-                                ref_already_added = False
-                                for existing_ref, ref_type in self.references:
-                                    existing_full_path = self.resolve_path(existing_ref, effective_dir)
-                                    if existing_full_path and os.path.normpath(existing_full_path) == os.path.normpath(resolved_path):
-                                        ref_already_added = True
-                                        break
-                                
-                                if not ref_already_added:
-                                    # 添加到references列表
-                                    self.references.append((path, "reference"))
-                                    # 递归处理引用的USD文件
-                                    self.extract_assets_from_usd(resolved_path, effective_dir)
-                except Exception as e:
-                    logger.error(f"处理USDA文件内容时出错: {str(e)}")
-                    logger.error(traceback.format_exc())
-            
-            # 3. 使用USD API检查材质和着色器
-            try:
-                stage = Usd.Stage.Open(abs_path)
-                if stage:
-                    logger.info(f"成功打开USD舞台: {abs_path}")
-                    
-                    # 检查subLayers
-                    layer_stack = stage.GetLayerStack()
-                    for layer in layer_stack:
-                        try:
-                            # 尝试使用 identifier 属性
-                            layer_path = layer.identifier
-                            if layer_path != abs_path:  # 跳过当前文件
-                                logger.info(f"发现subLayer: {layer_path}")
-                                self.referenced_usd_files.add(layer_path)
-                                # 添加到references列表
-                                self.references.append((layer_path, "subLayer"))
-                                # 递归处理subLayer
-                                self.extract_assets_from_usd(layer_path, effective_dir)
-                        except Exception as e:
-                            logger.warning(f"获取层标识符失败: {str(e)}")
-                    
-                    # 遍历所有prim
-                    for prim in stage.Traverse():
-                        logger.info(f"处理Prim: {prim.GetPath()}, 类型: {prim.GetTypeName()}")
-                        
-                        # 检查引用和payload
-                        if prim.HasReferences():
-                            refs = prim.GetReferences()
-                            for i in range(refs.GetNumReferences()):
-                                try:
-                                    ref = refs.GetReferencedLayer(i)
-                                    if ref:
-                                        ref_path = ref.identifier
-                                        logger.info(f"在Prim {prim.GetPath()} 上发现引用: {ref_path}")
-                                        self.referenced_usd_files.add(ref_path)
-                                        # 添加到references列表
-                                        self.references.append((ref_path, "reference"))
-                                        # 递归处理引用
-                                        self.extract_assets_from_usd(ref_path, effective_dir)
-                                except Exception as e:
-                                    logger.warning(f"处理引用失败: {str(e)}")
-                        
-                        if prim.HasPayloads():
-                            payloads = prim.GetPayloads()
-                            for i in range(payloads.GetNumPayloads()):
-                                try:
-                                    payload = payloads.GetPayloadAt(i)
-                                    if payload.GetAssetPath():
-                                        payload_path = payload.GetAssetPath()
-                                        logger.info(f"在Prim {prim.GetPath()} 上发现payload: {payload_path}")
-                                        self.referenced_usd_files.add(payload_path)
-                                        # 添加到references列表
-                                        self.references.append((payload_path, "payload"))
-                                        # 递归处理payload
-                                        resolved_payload_path = self.resolve_path(payload_path, effective_dir)
-                                        if resolved_payload_path:
-                                            self.extract_assets_from_usd(resolved_payload_path, effective_dir)
-                                except Exception as e:
-                                    logger.warning(f"处理payload失败: {str(e)}")
-                        
-                        # 检查材质
-                        if UsdShade.Material(prim):
-                            material = UsdShade.Material(prim)
-                            logger.info(f"发现材质: {prim.GetPath()}")
-                            self.collect_textures_from_material(material, effective_dir)
-                        
-                        # 检查着色器
-                        elif UsdShade.Shader(prim):
-                            shader = UsdShade.Shader(prim)
-                            shader_name = prim.GetName()
-                            
-                            logger.info(f"发现着色器: {prim.GetPath()}")
-                            self.examine_material_or_shader(prim, effective_dir)
-            except Exception as e:
-                logger.error(f"使用USD API处理文件时出错: {str(e)}")
-                logger.error(traceback.format_exc())
+            # 使用已读取的内容依次匹配常见的贴图定义模式和MDL中的贴图定义模式
+            matches = list(_iter_file_texture_paths(content))
+            for pattern in MDL_TEXTURE_PATTERNS:
+                matches.extend(pattern.findall(content))
+            for match in matches:
+                if self.is_likely_texture_path(match):
+                    resolved_path = self.resolve_path(match, base_dir)
+                    if resolved_path:
+                        self.add_texture_path(resolved_path, source_name)
 
         except Exception as e:
-            logger.error(f"处理USD文件时出错: {str(e)}")
+            logger.error("扫描文件 %s 失败: %s", file_path, str(e))
             logger.error(traceback.format_exc())
     
     def analyze_usd_file(self, file_path, original_dir=None):
         """分析USD文件，提取引用和贴图信息"""
-        logger.info(f"开始分析USD文件: {file_path}")
+        logger.info("开始分析USD文件: %s", file_path)
         
-        # 重置状态
-        self.processed_assets = set()
-        self.references = []
-        self.texture_files = {}
-        self.texture_udim_counts = {}  # 存储贴图的UDIM数量
+        # 重置状态，包括路径解析、os.stat和目录列表等缓存（缓存只在一次分析内有效，文件系统可能在两次分析之间发生变化）
+        self.reset()
         
         # 提取所有资产
         self.extract_assets_from_usd(file_path, original_dir)
         
         # 处理引用路径
         unique_references = []
-        unique_paths = set()
+        # 已添加路径的小写形式，用于不区分大小写的去重
+        unique_keys = set()
         
-        for ref_path, ref_type in self.references:
-            # 解析路径
-            resolved_path = self.resolve_path(ref_path, original_dir)
+        for ref_path, ref_type, resolved_path in self._references_map.values():
+            # 引用添加时已相对其所在文件的目录解析过，直接使用该结果；添加时无法解析的再相对original_dir解析
+            if not resolved_path:
+                resolved_path = self.resolve_path(ref_path, original_dir)
             if resolved_path:
                 # 检查文件是否存在
-                file_exists = os.path.exists(resolved_path)
+                file_exists = self._exists(resolved_path)
                 
                 # 只添加存在的文件
                 if file_exists:
@@ -824,20 +785,18 @@ class EnhancedUsdAnalyzer:
                     norm_path = self.normalize_path(resolved_path)
                     
                     # 使用不区分大小写的比较来检查是否已经添加过
-                    is_duplicate = False
-                    for existing_path in unique_paths:
-                        if norm_path.lower() == existing_path.lower():
-                            is_duplicate = True
-                            logger.info(f"跳过重复路径: {resolved_path} -> {norm_path}")
-                            break
+                    key = norm_path.lower()
+                    if key in unique_keys:
+                        logger.debug("跳过重复路径: %s -> %s", resolved_path, norm_path)
+                        continue
                     
-                    if norm_path and not is_duplicate:
-                        unique_paths.add(norm_path)
+                    if norm_path:
+                        unique_keys.add(key)
                         # 使用规范化后的路径
                         unique_references.append((norm_path, ref_type))
-                        logger.info(f"添加规范化路径: {norm_path}, 类型: {ref_type}")
+                        logger.debug("添加规范化路径: %s, 类型: %s", norm_path, ref_type)
                 else:
-                    logger.info(f"跳过不存在的文件: {resolved_path}")
+                    logger.debug("跳过不存在的文件: %s", resolved_path)
         
         self.references = unique_references
         
@@ -851,7 +810,7 @@ class EnhancedUsdAnalyzer:
                 
                 if norm_path:
                     # 检查贴图文件或目录是否存在
-                    is_udim = any(pattern in norm_path for pattern in ['<UDIM>', '<udim>', '.####.', '.<udim>.', '.<UDIM>.'])
+                    is_udim = any(marker in norm_path for marker in UDIM_MARKERS)
                     
                     if is_udim:
                         # 对于UDIM贴图，使用新的方法计算实际贴图数量
@@ -860,46 +819,47 @@ class EnhancedUsdAnalyzer:
                             unique_textures[norm_path] = source
                             # 保存UDIM贴图数量
                             self.texture_udim_counts[norm_path] = texture_count
-                            logger.info(f"添加UDIM贴图: {norm_path}, 来源: {source}, 实际贴图数量: {texture_count}")
+                            logger.debug("添加UDIM贴图: %s, 来源: %s, 实际贴图数量: %s", norm_path, source, texture_count)
                         else:
-                            logger.info(f"跳过无效的UDIM贴图(未找到匹配文件): {norm_path}")
+                            logger.debug("跳过无效的UDIM贴图(未找到匹配文件): %s", norm_path)
                     else:
-                        # 对于普通贴图，直接检查文件是否存在
-                        if os.path.exists(norm_path):
+                        # 对于普通贴图，通过目录列表缓存检查文件是否存在（同目录的贴图只列出一次目录）
+                        if self._file_listed(norm_path):
                             unique_textures[norm_path] = source
                             # 计算目录中所有贴图的数量
                             texture_count = self.count_actual_textures(norm_path)
                             self.texture_udim_counts[norm_path] = texture_count
-                            logger.info(f"添加普通贴图: {norm_path}, 来源: {source}, 实际贴图数量: {texture_count}")
+                            logger.debug("添加普通贴图: %s, 来源: %s, 实际贴图数量: %s", norm_path, source, texture_count)
                         else:
-                            logger.info(f"跳过不存在的贴图: {norm_path}")
+                            logger.debug("跳过不存在的贴图: %s", norm_path)
         
         self.texture_files = unique_textures
         
         # 构建结果
         result = {
-            "references": [{"path": ref, "type": ref_type, "exists": os.path.exists(ref)} for ref, ref_type in self.references],
+            # 上面只保留了存在的引用文件，无需再次检查
+            "references": [{"path": ref, "type": ref_type, "exists": True} for ref, ref_type in self.references],
             "textures": [{"path": path, "source": source, "exists": True, "actual_texture_count": self.texture_udim_counts.get(path, 1)} for path, source in self.texture_files.items()],
             "texture_udim_counts": self.texture_udim_counts
         }
         
-        logger.info(f"分析完成，找到 {len(self.references)} 个引用，{len(self.texture_files)} 个贴图")
+        logger.info("分析完成，找到 %s 个引用，%s 个贴图", len(self.references), len(self.texture_files))
         return result
     
     def collect_textures_from_material(self, material, base_dir):
         """从材质中收集贴图路径"""
-        logger.info(f"收集材质 {material.GetPath()} 中的贴图")
+        logger.debug("收集材质 %s 中的贴图", material.GetPath())
         
         # 获取材质的所有输入
         for input in material.GetInputs():
             input_name = input.GetName().lower()
-            logger.info(f"检查材质输入: {input_name}")
+            logger.debug("检查材质输入: %s", input_name)
             self.collect_textures_from_input(input, base_dir, material.GetPrim().GetName())
         
         # 获取材质的所有输出
         for output in material.GetOutputs():
             output_name = output.GetName().lower()
-            logger.info(f"检查材质输出: {output_name}")
+            logger.debug("检查材质输出: %s", output_name)
             
             # 检查输出的连接
             if output.HasConnectedSource():
@@ -909,7 +869,7 @@ class EnhancedUsdAnalyzer:
                     if UsdShade.Shader(source_prim):
                         shader = UsdShade.Shader(source_prim)
                         shader_name = shader.GetPrim().GetName()
-                        logger.info(f"材质输出连接到着色器: {shader_name}")
+                        logger.debug("材质输出连接到着色器: %s", shader_name)
                         
                         # 检查着色器的所有输入
                         for shader_input in shader.GetInputs():
@@ -917,7 +877,7 @@ class EnhancedUsdAnalyzer:
     
     def examine_material_or_shader(self, prim, base_dir):
         """检查材质或着色器定义"""
-        logger.info(f"检查材质或着色器: {prim.GetPath()}")
+        logger.debug("检查材质或着色器: %s", prim.GetPath())
         
         # 如果是材质
         if UsdShade.Material(prim):
@@ -931,11 +891,11 @@ class EnhancedUsdAnalyzer:
             shader_id = shader.GetShaderId()
             shader_name = prim.GetName()
             
-            logger.info(f"着色器ID: {shader_id}, 名称: {shader_name}")
+            logger.debug("着色器ID: %s, 名称: %s", shader_id, shader_name)
             
             # 特别处理UsdUVTexture
             if shader_id and "UsdUVTexture" in shader_id:
-                logger.info(f"发现UsdUVTexture: {prim.GetPath()}")
+                logger.debug("发现UsdUVTexture: %s", prim.GetPath())
                 
                 # 查找file输入
                 file_input = shader.GetInput("file")
@@ -946,13 +906,13 @@ class EnhancedUsdAnalyzer:
                         if resolved_path:
                             # 使用着色器名称作为来源
                             source = f"UsdUVTexture:{shader_name}"
-                            logger.info(f"添加UsdUVTexture贴图: {resolved_path}, 来源: {source}")
+                            logger.debug("添加UsdUVTexture贴图: %s, 来源: %s", resolved_path, source)
                             self.add_texture_path(resolved_path, source)
             
             # 检查着色器的所有输入
             for input in shader.GetInputs():
                 input_name = input.GetName().lower()
-                logger.info(f"检查着色器输入: {input_name}")
+                logger.debug("检查着色器输入: %s", input_name)
                 self.collect_textures_from_input(input, base_dir, shader_name)
 
     def collect_textures_from_input(self, input, base_dir, source_name=None):
@@ -966,7 +926,7 @@ class EnhancedUsdAnalyzer:
                     input_name = input.GetAttr().GetName().lower()
                 except:
                     input_name = "unknown_input"
-                    logger.warning(f"无法获取输入名称，使用默认名称: {input_name}")
+                    logger.warning("无法获取输入名称，使用默认名称: %s", input_name)
             
             # 如果没有提供来源名称，使用输入所在的prim名称
             if source_name is None:
@@ -974,12 +934,10 @@ class EnhancedUsdAnalyzer:
                     source_name = input.GetAttr().GetPrim().GetName()
                 except:
                     source_name = "unknown_source"
-                    logger.warning(f"无法获取输入来源，使用默认来源: {source_name}")
+                    logger.warning("无法获取输入来源，使用默认来源: %s", source_name)
             
             # 检查输入名称是否与贴图相关
-            texture_related = any(tex_key in input_name.lower() for tex_key in
-                                ["texture", "file", "map", "image", "tex", "diffuse", "albedo", "normal", "roughness", "metallic",
-                                "specular", "emission", "occlusion", "height", "bump", "color", "opacity", "displacement"])
+            texture_related = bool(TEXTURE_INPUT_NAME_RE.search(input_name))
             
             # 检查输入的连接
             if input.HasConnectedSource():
@@ -989,19 +947,19 @@ class EnhancedUsdAnalyzer:
                     if UsdShade.Shader(source_prim):
                         shader = UsdShade.Shader(source_prim)
                         shader_name = shader.GetPrim().GetName()
-                        logger.info(f"发现连接到着色器: {shader_name}")
+                        logger.debug("发现连接到着色器: %s", shader_name)
                         
                         # 检查着色器的所有输入
                         for shader_input in shader.GetInputs():
                             self.collect_textures_from_input(shader_input, base_dir, shader_name)
         except Exception as e:
-            logger.error(f"处理输入连接时出错: {str(e)}")
+            logger.error("处理输入连接时出错: %s", str(e))
             logger.error(traceback.format_exc())
     
     def scan_mdl_file_for_textures(self, mdl_path, source_name=None):
         """扫描MDL文件中的贴图引用"""
         try:
-            if not os.path.exists(mdl_path):
+            if not self._exists(mdl_path):
                 return
 
             base_dir = os.path.dirname(mdl_path)
@@ -1014,14 +972,8 @@ class EnhancedUsdAnalyzer:
                 content = f.read()
 
             # MDL中的贴图定义模式
-            texture_patterns = [
-                r'texture_2d\s*"([^"]+)"',  # texture_2d "path/to/texture.jpg"
-                r'tex::texture_2d\s*\(\s*"([^"]+)"\s*\)',  # tex::texture_2d("path/to/texture.jpg")
-                r'file\s*=\s*"([^"]+)"',  # file = "path/to/texture.jpg"
-            ]
-
-            for pattern in texture_patterns:
-                matches = re.findall(pattern, content)
+            for pattern in MDL_TEXTURE_PATTERNS:
+                matches = pattern.findall(content)
                 for match in matches:
                     if self.is_likely_texture_path(match):
                         resolved_path = self.resolve_path(match, base_dir)
@@ -1029,476 +981,311 @@ class EnhancedUsdAnalyzer:
                             self.add_texture_path(resolved_path, source_name)
 
         except Exception as e:
-            logger.error(f"扫描文件 {mdl_path} 失败: {str(e)}")
+            logger.error("扫描文件 %s 失败: %s", mdl_path, str(e))
             logger.error(traceback.format_exc())
     
+    def _add_resolved_texture(self, path, source, base_dir, added_textures):
+        """解析贴图路径并添加到纹理列表，同时将规范化后的路径记录到added_textures集合"""
+        resolved_path = self.resolve_path(path, base_dir)
+        if resolved_path:
+            self.add_texture_path(resolved_path, source)
+            added_textures.add(self._normpath(resolved_path))
+    
     def extract_textures_from_usda(self, file_path, base_dir=None):
         """从USDA文件中提取纹理路径"""
-        logger.info(f"从USDA文件中提取纹理: {file_path}")
-        logger.info(f"基础目录: {base_dir}")
+        logger.debug("从USDA文件中提取纹理: %s", file_path)
+        logger.debug("基础目录: %s", base_dir)
         
         try:
             # 检查文件是否存在
-            if not os.path.exists(file_path):
-                logger.error(f"USDA文件不存在: {file_path}")
+            if not self._exists(file_path):
+                logger.error("USDA文件不存在: %s", file_path)
                 return
                 
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
-            # 记录文件内容的前100个字符，用于调试
-            logger.info(f"文件内容前100个字符: {content[:100]}")
-            logger.info(f"文件内容长度: {len(content)} 字符")
-            
-            # 提取纹理路径的模式
-            # 1. asset inputs:texture_name = @path@
-            texture_pattern1 = r'asset\s+inputs:([a-zA-Z0-9_]+)\s*=\s*@([^@]+)@'
-            # 2. asset inputs:texture_name:file = @path@
-            texture_pattern2 = r'asset\s+inputs:([a-zA-Z0-9_]+):file\s*=\s*@([^@]+)@'
-            # 3. filename = @path@
-            texture_pattern3 = r'filename\s*=\s*@([^@]+)@'
-            # 4. file = @path@
-            texture_pattern4 = r'file\s*=\s*@([^@]+)@'
-            # 5. 其他可能的模式
-            texture_pattern5 = r'texture\s*=\s*@([^@]+)@'
-            texture_pattern6 = r'colorMap\s*=\s*@([^@]+)@'
-            # 7. 通用的 asset 属性模式
-            texture_pattern7 = r'asset\s+([a-zA-Z0-9_:]+)\s*=\s*@([^@]+)@'
-            # 8. inputs:*_texture 模式 (特别针对您提供的USDA文件格式)
-            texture_pattern8 = r'inputs:([a-zA-Z0-9_]+)_texture\s*=\s*@([^@]+)@'
-            # 9. 查找 inputs:file 模式 (特别针对您提供的USDA文件格式)
-            texture_pattern9 = r'inputs:file\s*=\s*@([^@]+)@'
-            # 10. 在 @ 符号之间的 UDIM 路径 (针对您提供的USDA文件格式)
-            texture_pattern10 = r'@([^@]*(?:<UDIM>|<udim>|\.####\.|\.1001\.|\.10[0-9][0-9]\.|\.udim\.|\.UDIM\.)[^@]*)@'
-            
-            # 记录所有找到的纹理路径
-            all_textures = []
-            
-            # 1. 查找 asset inputs:texture_name = @path@ 模式
-            matches1 = re.findall(texture_pattern1, content)
-            logger.info(f"模式1找到 {len(matches1)} 个匹配")
-            for input_name, path in matches1:
-                logger.info(f"模式1匹配: input={input_name}, path={path}")
-                if self.is_likely_texture_path(path):
-                    resolved_path = self.resolve_path(path, base_dir)
-                    if resolved_path:
-                        context = os.path.basename(file_path)
-                        self.add_texture_path(resolved_path, f"{context}:{input_name}")
-                        all_textures.append((resolved_path, input_name))
-            
-            # 2. 查找 asset inputs:texture_name:file = @path@ 模式
-            matches2 = re.findall(texture_pattern2, content)
-            logger.info(f"模式2找到 {len(matches2)} 个匹配")
-            for input_name, path in matches2:
-                logger.info(f"模式2匹配: input={input_name}, path={path}")
-                if self.is_likely_texture_path(path):
-                    resolved_path = self.resolve_path(path, base_dir)
-                    if resolved_path:
-                        context = os.path.basename(file_path)
-                        self.add_texture_path(resolved_path, f"{context}:{input_name}")
-                        all_textures.append((resolved_path, input_name))
-            
-            # 3. 查找 filename = @path@ 模式
-            matches3 = re.findall(texture_pattern3, content)
-            logger.info(f"模式3找到 {len(matches3)} 个匹配")
-            for path in matches3:
-                logger.info(f"模式3匹配: path={path}")
-                if self.is_likely_texture_path(path):
-                    resolved_path = self.resolve_path(path, base_dir)
-                    if resolved_path:
-                        context = os.path.basename(file_path)
-                        self.add_texture_path(resolved_path, f"{context}:filename")
-                        all_textures.append((resolved_path, "filename"))
-            
-            # 4. 查找 file = @path@ 模式
-            matches4 = re.findall(texture_pattern4, content)
-            logger.info(f"模式4找到 {len(matches4)} 个匹配")
-            for path in matches4:
-                logger.info(f"模式4匹配: path={path}")
-                if self.is_likely_texture_path(path):
-                    resolved_path = self.resolve_path(path, base_dir)
-                    if resolved_path:
-                        context = os.path.basename(file_path)
-                        self.add_texture_path(resolved_path, f"{context}:file")
-                        all_textures.append((resolved_path, "file"))
-            
-            # 5. 查找其他可能的模式
-            matches5 = re.findall(texture_pattern5, content)
-            logger.info(f"模式5找到 {len(matches5)} 个匹配")
-            for path in matches5:
-                logger.info(f"模式5匹配: path={path}")
-                if self.is_likely_texture_path(path):
-                    resolved_path = self.resolve_path(path, base_dir)
-                    if resolved_path:
-                        context = os.path.basename(file_path)
-                        self.add_texture_path(resolved_path, f"{context}:texture")
-                        all_textures.append((resolved_path, "texture"))
-            
-            matches6 = re.findall(texture_pattern6, content)
-            logger.info(f"模式6找到 {len(matches6)} 个匹配")
-            for path in matches6:
-                logger.info(f"模式6匹配: path={path}")
-                if self.is_likely_texture_path(path):
-                    resolved_path = self.resolve_path(path, base_dir)
-                    if resolved_path:
-                        context = os.path.basename(file_path)
-                        self.add_texture_path(resolved_path, f"{context}:colorMap")
-                        all_textures.append((resolved_path, "colorMap"))
-                        
-            # 7. 查找通用的 asset 属性模式
-            matches7 = re.findall(texture_pattern7, content)
-            logger.info(f"模式7找到 {len(matches7)} 个匹配")
-            for attr_name, path in matches7:
-                logger.info(f"模式7匹配: attr={attr_name}, path={path}")
-                if self.is_likely_texture_path(path):
-                    resolved_path = self.resolve_path(path, base_dir)
-                    if resolved_path:
-                        context = os.path.basename(file_path)
-                        self.add_texture_path(resolved_path, f"{context}:{attr_name}")
-                        all_textures.append((resolved_path, attr_name))
-            
-            # 8. inputs:*_texture 模式 (特别针对您提供的USDA文件格式)
-            matches8 = re.findall(texture_pattern8, content)
-            logger.info(f"模式8找到 {len(matches8)} 个匹配")
-            for input_name, path in matches8:
-                logger.info(f"模式8匹配: input={input_name}, path={path}")
-                if self.is_likely_texture_path(path):
-                    resolved_path = self.resolve_path(path, base_dir)
-                    if resolved_path:
-                        context = os.path.basename(file_path)
-                        self.add_texture_path(resolved_path, f"{context}:{input_name}")
-                        all_textures.append((resolved_path, input_name))
-                    
-            # 9. 查找 inputs:file 模式 (特别针对您提供的USDA文件格式)
-            matches9 = re.findall(texture_pattern9, content)
-            logger.info(f"模式9找到 {len(matches9)} 个匹配")
-            for path in matches9:
-                logger.info(f"模式9匹配: path={path}")
+            with _open_text_bytes(file_path) as content:
+                # 记录文件内容的前100个字节，用于调试（解码只在DEBUG级别启用时进行）
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("文件内容前100个字节: %s", content[:100].decode('utf-8', 'ignore'))
+                    logger.debug("文件内容长度: %s 字节", len(content))
+                
+                # 只扫描一次文件内容，提取所有 @ 符号之间的内容及其所在行中位于路径之前的部分
+                at_tokens = []
+                for start, path in _iter_at_tokens(content):
+                    line_start = content.rfind(b'\n', 0, start) + 1
+                    at_tokens.append((start, content[line_start:start].decode('utf-8', 'ignore'), path.decode('utf-8', 'ignore')))
+                
+                # 查找所有引号内的路径，可能是纹理路径
+                path_matches = [path.decode('utf-8', 'ignore') for path in QUOTED_TEXTURE_PATH_RE.findall(content)]
+                
+                # 所有 UDIM 模式只扫描一次，按出现顺序去重
+                udim_matches = list(dict.fromkeys(path.decode('utf-8', 'ignore') for path in QUOTED_UDIM_RE.findall(content)))
+            
+            # 记录所有找到的纹理路径（规范化后），用于O(1)判断是否已经添加过
+            all_textures = set()
+            # 当前USDA文件名，用作贴图来源
+            context = os.path.basename(file_path)
+            
+            # 按路径所在行判断纹理属性，并按属性模式的优先级和在文件中的位置排序，保证同一路径优先记录优先级最高的来源
+            attr_matches = []
+            for start, prefix, path in at_tokens:
+                priority = None
+                if '=' in prefix:
+                    for index, (pattern, source_name) in enumerate(USDA_TEXTURE_ATTR_PATTERNS):
+                        attr_match = pattern.search(prefix)
+                        if attr_match:
+                            priority, input_name = index, source_name or attr_match.group(1)
+                            break
+                if priority is None and USDA_UDIM_TOKEN_RE.search(path):
+                    priority, input_name = len(USDA_TEXTURE_ATTR_PATTERNS), "UDIM"
+                if priority is not None:
+                    attr_matches.append((priority, start, input_name, path))
+            attr_matches.sort()
+            logger.debug("属性模式找到 %s 个匹配", len(attr_matches))
+            
+            for _, _, input_name, path in attr_matches:
+                logger.debug("属性模式匹配: input=%s, path=%s", input_name, path)
                 if self.is_likely_texture_path(path):
-                    resolved_path = self.resolve_path(path, base_dir)
-                    if resolved_path:
-                        context = os.path.basename(file_path)
-                        self.add_texture_path(resolved_path, f"{context}:file")
-                        all_textures.append((resolved_path, "file"))
+                    self._add_resolved_texture(path, f"{context}:{input_name}", base_dir, all_textures)
             
-            # 10. 在 @ 符号之间的 UDIM 路径 (针对您提供的USDA文件格式)
-            matches10 = re.findall(texture_pattern10, content)
-            logger.info(f"模式10找到 {len(matches10)} 个匹配")
-            for path in matches10:
-                logger.info(f"模式10匹配: path={path}")
-                if self.is_likely_texture_path(path):
+            # 11. 直接提取所有 @ 符号之间的内容（最通用的方法）
+            # 先按文本判断类型，只对USD引用和贴图路径进行解析，避免为其他内容访问文件系统
+            logger.debug("提取所有@符号之间的内容，找到 %s 个匹配", len(at_tokens))
+            for _, _, path in at_tokens:
+                logger.debug("@符号之间的内容: %s", path)
+                path_lower = path.lower()
+                
+                # 检查是否是USD文件引用（.usda/.usdc/.usdz都包含.usd）
+                if '.usd' in path_lower:
                     resolved_path = self.resolve_path(path, base_dir)
                     if resolved_path:
-                        context = os.path.basename(file_path)
-                        self.add_texture_path(resolved_path, f"{context}:UDIM")
-                        all_textures.append((resolved_path, "UDIM"))
-            
-            # 11. 直接提取所有 @ 符号之间的内容（最通用的方法）
-            all_at_pattern = r'@([^@]+)@'
-            all_at_matches = re.findall(all_at_pattern, content)
-            logger.info(f"提取所有@符号之间的内容，找到 {len(all_at_matches)} 个匹配")
-            for path in all_at_matches:
-                logger.info(f"@符号之间的内容: {path}")
-                # 解析路径
-                resolved_path = self.resolve_path(path, base_dir)
-                if resolved_path:
-                    context = os.path.basename(file_path)
-                    
-                    # 检查是否是USD文件引用
-                    if '.usda' in path.lower() or '.usd' in path.lower() or '.usdz' in path.lower():
-                        logger.info(f"从@符号中发现USD引用: {path} -> {resolved_path}")
-                        # 检查是否已经添加过这个引用
-                        ref_already_added = False
-                        for existing_ref, ref_type in self.references:
-                            existing_full_path = self.resolve_path(existing_ref, base_dir)
-                            if existing_full_path and os.path.normpath(existing_full_path) == os.path.normpath(resolved_path):
-                                ref_already_added = True
-                                break
-                        
-                        if not ref_already_added:
-                            # 添加到references列表
-                            self.references.append((path, "reference"))
+                        logger.debug("从@符号中发现USD引用: %s -> %s", path, resolved_path)
+                        # 检查是否已经添加过这个引用，未添加过时加入references列表
+                        if self._add_reference(path, "reference", base_dir):
                             # 递归处理引用的USD文件
                             self.extract_assets_from_usd(resolved_path, base_dir)
-                    # 检查是否是贴图路径
-                    elif any(ext in path.lower() for ext in ['.jpg', '.jpeg', '.png', '.tif', '.tiff', '.exr', '.hdr']):
-                        # 检查是否包含 UDIM 相关字符
-                        if any(pattern in path for pattern in ['<UDIM>', '<udim>', '.####.', '.<udim>.', '.<UDIM>.']):
-                            logger.info(f"发现UDIM路径: {path} -> {resolved_path}")
-                            self.add_texture_path(resolved_path, f"{context}:UDIM")
-                        else:
-                            logger.info(f"发现普通路径: {path} -> {resolved_path}")
-                            self.add_texture_path(resolved_path, f"{context}:asset")
-                        all_textures.append((resolved_path, "asset"))
+                # 检查是否是贴图路径
+                elif path_lower.endswith(AT_TEXTURE_EXTENSIONS):
+                    # 检查是否包含 UDIM 相关字符
+                    if any(marker in path for marker in UDIM_MARKERS):
+                        logger.debug("发现UDIM路径: %s", path)
+                        self._add_resolved_texture(path, f"{context}:UDIM", base_dir, all_textures)
+                    else:
+                        logger.debug("发现普通路径: %s", path)
+                        self._add_resolved_texture(path, f"{context}:asset", base_dir, all_textures)
             
-            # 查找所有引号内的路径，可能是纹理路径
-            # 这是一个更通用的方法，可能会有更多的误报，所以放在最后
-            path_pattern = r'"([^"]+\.(jpg|jpeg|png|tif|tiff|exr|hdr|tx|tex|bmp|gif|psd|tga|iff|dpx|cin|svg))"'
-            path_matches = re.findall(path_pattern, content, re.IGNORECASE)
-            logger.info(f"通用路径模式找到 {len(path_matches)} 个匹配")
+            # 引号内的路径是一个更通用的方法，可能会有更多的误报，所以放在最后
+            logger.debug("通用路径模式找到 %s 个匹配", len(path_matches))
             
-            for path, ext in path_matches:
+            for path in path_matches:
                 # 检查是否已经添加过
-                already_added = False
-                for added_path, _ in all_textures:
-                    if os.path.normpath(path) == os.path.normpath(added_path):
-                        already_added = True
-                        break
+                already_added = self._normpath(path) in all_textures
                 
                 if not already_added and self.is_likely_texture_path(path):
-                    logger.info(f"通用路径匹配: path={path}")
-                    resolved_path = self.resolve_path(path, base_dir)
-                    if resolved_path:
-                        context = os.path.basename(file_path)
-                        self.add_texture_path(resolved_path, f"{context}:generic")
-                        all_textures.append((resolved_path, "generic"))
+                    logger.debug("通用路径匹配: path=%s", path)
+                    self._add_resolved_texture(path, f"{context}:generic", base_dir, all_textures)
             
             # 特别处理 UDIM 纹理 - 增强版
-            # 1. 标准 UDIM 格式
-            udim_pattern1 = r'"([^"]*(?:<UDIM>|<udim>)[^"]*)"'
-            # 2. 数字格式 UDIM
-            udim_pattern2 = r'"([^"]*(?:\.####\.|\.1001\.|\.10[0-9][0-9]\.)[^"]*)"'
-            # 3. 文本 udim 格式
-            udim_pattern3 = r'"([^"]*(?:\.udim\.|\.UDIM\.)[^"]*)"'
-            # 4. 任何包含 udim 的路径
-            udim_pattern4 = r'"([^"]*udim[^"]*\.(jpg|jpeg|png|tif|tiff|exr|hdr|tx|tex))"'
-            
-            # 合并所有 UDIM 模式的结果
-            udim_matches = []
-            for pattern in [udim_pattern1, udim_pattern2, udim_pattern3, udim_pattern4]:
-                matches = re.findall(pattern, content, re.IGNORECASE)
-                if isinstance(matches[0], tuple) if matches else False:
-                    # 如果匹配结果是元组（带有扩展名的情况），只取路径部分
-                    matches = [m[0] for m in matches]
-                udim_matches.extend(matches)
-            
-            logger.info(f"UDIM模式找到 {len(udim_matches)} 个匹配: {udim_matches}")
+            logger.debug("UDIM模式找到 %s 个匹配: %s", len(udim_matches), udim_matches)
             
             for path in udim_matches:
                 # 检查是否已经添加过
-                already_added = False
-                for added_path, _ in all_textures:
-                    if os.path.normpath(path) == os.path.normpath(added_path):
-                        already_added = True
-                        break
+                already_added = self._normpath(path) in all_textures
                 
                 if not already_added:
-                    logger.info(f"UDIM路径匹配: path={path}")
-                    resolved_path = self.resolve_path(path, base_dir)
-                    if resolved_path:
-                        context = os.path.basename(file_path)
-                        self.add_texture_path(resolved_path, f"{context}:UDIM")
-                        all_textures.append((resolved_path, "UDIM"))
+                    logger.debug("UDIM路径匹配: path=%s", path)
+                    self._add_resolved_texture(path, f"{context}:UDIM", base_dir, all_textures)
             
             # 记录找到的纹理总数
-            logger.info(f"从USDA文件中提取的纹理总数: {len(self.texture_files)}")
+            logger.debug("从USDA文件中提取的纹理总数: %s", len(self.texture_files))
             
         except Exception as e:
-            logger.error(f"从USDA文件中提取纹理时出错: {str(e)}")
+            logger.error("从USDA文件中提取纹理时出错: %s", str(e))
             logger.error(traceback.format_exc())
 
+    def _prefetch_at_references(self, paths, base_dir):
+        """并行预读@符号之间的内容中将被_classify_at_path作为USD引用继续处理的文件"""
+        self._prefetch_text_scans([
+            resolved_path for resolved_path in (
+                self.resolve_path(path, base_dir) for path in paths
+                if not path.lower().endswith(AT_TEXTURE_EXTENSIONS) and '.usd' in path.lower()
+            ) if resolved_path
+        ])
+
+    def _classify_at_path(self, path, base_dir, source_prefix):
+        """对@符号之间的内容分类：贴图路径加入纹理列表；新发现的USD引用加入references列表，并返回解析后的路径供继续处理，否则返回None"""
+        logger.debug("@符号之间的内容: %s", path)
+        path_lower = path.lower()
+        # 检查是否是贴图路径
+        if path_lower.endswith(AT_TEXTURE_EXTENSIONS):
+            # 解析路径
+            resolved_path = self.resolve_path(path, base_dir)
+            if resolved_path:
+                # 检查是否包含UDIM相关字符
+                if any(marker in path for marker in UDIM_SEQUENCE_MARKERS):
+                    self.add_texture_path(resolved_path, f"{source_prefix}:UDIM")
+                    logger.debug("添加UDIM贴图: %s", resolved_path)
+                else:
+                    self.add_texture_path(resolved_path, f"{source_prefix}:texture")
+                    logger.debug("添加普通贴图: %s", resolved_path)
+        # 检查是否是USD文件引用
+        elif '.usd' in path_lower:
+            # 解析路径
+            resolved_path = self.resolve_path(path, base_dir)
+            if resolved_path:
+                logger.debug("从@符号中发现USD引用: %s -> %s", path, resolved_path)
+                # 检查是否已经添加过这个引用，未添加过时加入references列表
+                if self._add_reference(path, "reference", base_dir):
+                    return resolved_path
+        return None
+
     def extract_assets_from_usd(self, usd_file_path, base_dir=None):
         """从USD文件中提取所有资产"""
-        # 如果已经处理过这个文件，则跳过
+        # 用显式栈代替递归：每个文件的处理过程在遇到需要处理的引用文件时交出(路径, 基础目录)，
+        # 按与递归相同的深度优先顺序处理，避免引用链过深时超出Python的递归深度限制
+        stack = [self._extract_assets_steps(usd_file_path, base_dir)]
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+            elif not self._is_asset_processed(*child):
+                stack.append(self._extract_assets_steps(*child))
+    
+    def _is_asset_processed(self, usd_file_path, base_dir=None):
+        """判断USD文件是否已经处理过（或无法解析），与_extract_assets_steps开头的检查一致，用于在创建处理过程之前跳过"""
+        abs_path = self.resolve_path(usd_file_path, base_dir)
+        return not abs_path or self._path_key(abs_path) in self.processed_assets
+
+    def _extract_assets_steps(self, usd_file_path, base_dir=None):
+        """处理单个USD文件的生成器，遇到引用的USD文件时交出(路径, 基础目录)，由extract_assets_from_usd依次处理"""
+        # 如果已经处理过这个文件，则跳过（按规范化路径判断，同一文件的不同写法只处理一次）
         abs_path = self.resolve_path(usd_file_path, base_dir)
-        if not abs_path or abs_path in self.processed_assets:
+        if not abs_path:
+            return
+        asset_key = self._path_key(abs_path)
+        if asset_key in self.processed_assets:
             return
 
-        self.processed_assets.add(abs_path)
-        logger.info(f"正在处理USD文件: {abs_path}")
+        self.processed_assets.add(asset_key)
+        logger.debug("正在处理USD文件: %s", abs_path)
 
         # 获取文件所在目录作为基础目录
         current_dir = os.path.dirname(abs_path)
         
         # 如果提供了原始目录，优先使用它来解析相对路径
         effective_dir = base_dir if base_dir else current_dir
-        logger.info(f"使用有效目录进行解析: {effective_dir}")
+        logger.debug("使用有效目录进行解析: %s", effective_dir)
         
         # 获取当前处理的USD文件名，用作贴图来源
         current_usd_name = os.path.basename(abs_path)
-        logger.info(f"当前处理的USD文件: {current_usd_name}")
+        logger.debug("当前处理的USD文件: %s", current_usd_name)
         
-        # 用于检查引用是否已经添加过
-        def is_reference_already_added(ref_path):
-            """检查引用是否已经添加过"""
-            resolved_ref_path = self.resolve_path(ref_path, effective_dir)
-            if not resolved_ref_path:
-                return False
-                
-            for existing_ref, _ in self.references:
-                existing_full_path = self.resolve_path(existing_ref, effective_dir)
-                if existing_full_path and os.path.normpath(existing_full_path) == os.path.normpath(resolved_ref_path):
-                    return True
-            return False
-
         try:
             # 检查文件是否存在
-            if not os.path.exists(abs_path):
-                logger.error(f"文件不存在: {abs_path}")
+            if not self._exists(abs_path):
+                logger.error("文件不存在: %s", abs_path)
                 return
                 
             # 检查文件扩展名
             file_ext = os.path.splitext(abs_path)[1].lower()
-            logger.info(f"文件扩展名: {file_ext}")
+            logger.debug("文件扩展名: %s", file_ext)
             
             # 首先检查是否有shader文件夹，如果有，优先处理shader/main.usda
             shader_dir = os.path.join(os.path.dirname(abs_path), 'shader')
-            has_shader_folder = os.path.exists(shader_dir) and os.path.isdir(shader_dir)
+            has_shader_folder = self._exists(shader_dir) and self._isdir(shader_dir)
             
-            logger.info(f"检查shader文件夹: {shader_dir}, 存在: {has_shader_folder}")
+            logger.debug("检查shader文件夹: %s, 存在: %s", shader_dir, has_shader_folder)
             
             if has_shader_folder:
-                logger.info(f"发现shader文件夹: {shader_dir}")
+                logger.debug("发现shader文件夹: %s", shader_dir)
                 main_usda_path = os.path.join(shader_dir, 'main.usda')
                 
-                logger.info(f"检查main.usda文件: {main_usda_path}, 存在: {os.path.exists(main_usda_path)}")
+                logger.debug("检查main.usda文件: %s, 存在: %s", main_usda_path, self._exists(main_usda_path))
                 
-                if os.path.exists(main_usda_path) and os.path.isfile(main_usda_path):
-                    logger.info(f"发现shader/main.usda文件: {main_usda_path}")
+                if self._exists(main_usda_path) and self._isfile(main_usda_path):
+                    logger.debug("发现shader/main.usda文件: %s", main_usda_path)
                     
                     # 添加到引用列表，如果不存在的话
-                    if not is_reference_already_added(main_usda_path):
-                        self.references.append((main_usda_path, "shader"))
+                    self._add_reference(main_usda_path, "shader", effective_dir)
                     
                     # 清空当前的纹理列表，只使用shader/main.usda中的纹理
                     self.texture_files.clear()
-                    logger.info("已清空纹理列表，将只使用shader/main.usda中的纹理")
+                    logger.debug("已清空纹理列表，将只使用shader/main.usda中的纹理")
                     
                     # 直接读取main.usda文件内容并提取所有@符号之间的内容
                     try:
-                        with open(main_usda_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            content = f.read()
-                            
                         # 提取所有@符号之间的内容
-                        pattern = r'@([^@]+)@'
-                        matches = re.findall(pattern, content)
-                        logger.info(f"从shader/main.usda中找到 {len(matches)} 个@符号之间的内容")
+                        with _open_text_bytes(main_usda_path) as content:
+                            matches = [path.decode('utf-8', 'ignore') for _, path in _iter_at_tokens(content)]
+                        logger.debug("从shader/main.usda中找到 %s 个@符号之间的内容", len(matches))
                         
+                        # 重复的内容不会再添加贴图或引用，按出现顺序去重后只分类一次
+                        matches = list(dict.fromkeys(matches))
+                        self._prefetch_at_references(matches, shader_dir)
                         for path in matches:
-                            logger.info(f"@符号之间的内容: {path}")
-                            # 检查是否是贴图路径
-                            if '.' in path and any(ext in path.lower() for ext in ['.jpg', '.jpeg', '.png', '.tif', '.tiff', '.exr', '.hdr']):
-                                # 解析路径
-                                resolved_path = self.resolve_path(path, shader_dir)
-                                if resolved_path:
-                                    # 检查是否包含UDIM相关字符
-                                    if any(pattern in path for pattern in ['<UDIM>', '<udim>', '.####.', '.1001.']):
-                                        self.add_texture_path(resolved_path, "shader:UDIM")
-                                        logger.info(f"添加UDIM贴图: {resolved_path}")
-                                    else:
-                                        self.add_texture_path(resolved_path, "shader:texture")
-                                        logger.info(f"添加普通贴图: {resolved_path}")
-                            # 检查是否是USD文件引用
-                            elif '.usda' in path.lower() or '.usd' in path.lower() or '.usdz' in path.lower():
-                                # 解析路径
-                                resolved_path = self.resolve_path(path, shader_dir)
-                                if resolved_path:
-                                    logger.info(f"从@符号中发现USD引用: {path} -> {resolved_path}")
-                                    # 检查是否已经添加过这个引用
-                                    ref_already_added = False
-                                    for existing_ref, ref_type in self.references:
-                                        existing_full_path = self.resolve_path(existing_ref, shader_dir)
-                                        if existing_full_path and os.path.normpath(existing_full_path) == os.path.normpath(resolved_path):
-                                            ref_already_added = True
-                                            break
-                                    
-                                    if not ref_already_added:
-                                        # 添加到references列表
-                                        self.references.append((path, "reference"))
-                                        # 递归处理引用的USD文件
-                                        self.extract_assets_from_usd(resolved_path, shader_dir)
+                            ref_path = self._classify_at_path(path, shader_dir, "shader")
+                            if ref_path:
+                                # 递归处理引用的USD文件
+                                yield ref_path, shader_dir
                     except Exception as e:
-                        logger.error(f"处理shader/main.usda文件时出错: {str(e)}")
+                        logger.error("处理shader/main.usda文件时出错: %s", str(e))
                         logger.error(traceback.format_exc())
                     
                     # 如果找到了纹理，则直接返回，不再处理其他文件
                     if self.texture_files:
-                        logger.info(f"从shader/main.usda中找到了 {len(self.texture_files)} 个纹理，跳过其他处理")
-                        logger.info(f"找到的纹理: {list(self.texture_files.keys())}")
+                        logger.debug("从shader/main.usda中找到了 %s 个纹理，跳过其他处理", len(self.texture_files))
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("找到的纹理: %s", list(self.texture_files.keys()))
                         return
                     else:
-                        logger.info("从shader/main.usda中没有找到纹理，将继续处理其他文件")
+                        logger.debug("从shader/main.usda中没有找到纹理，将继续处理其他文件")
             
             # 如果没有找到shader/main.usda或者没有从中提取到纹理，则继续处理主文件
             
             # 1. 从文本中提取引用
             text_references = self.extract_references_from_text(abs_path)
             if text_references:
-                logger.info(f"从文本中发现 {len(text_references)} 个引用:")
+                logger.debug("从文本中发现 %s 个引用:", len(text_references))
+                # 递归处理是串行的（结果依赖处理顺序），但各引用文件的读取和文本扫描互不依赖，先并行预读
+                self._prefetch_text_scans([path for path in (self.resolve_path(ref, effective_dir) for ref in text_references) if path])
                 for ref in text_references:
-                    logger.info(f"文本引用: {ref}")
+                    logger.debug("文本引用: %s", ref)
                     # 使用有效目录解析相对路径
                     full_ref_path = self.resolve_path(ref, effective_dir)
                     if full_ref_path:
-                        # 检查是否已经添加过这个引用
-                        ref_already_added = False
-                        for existing_ref, ref_type in self.references:
-                            existing_full_path = self.resolve_path(existing_ref, effective_dir)
-                            if existing_full_path and os.path.normpath(existing_full_path) == os.path.normpath(full_ref_path):
-                                ref_already_added = True
-                                break
-                        
-                        if not ref_already_added:
-                            logger.info(f"添加新引用并递归处理: {full_ref_path}")
+                        # 检查是否已经添加过这个引用，未添加过时加入references列表
+                        if self._add_reference(ref, "reference", effective_dir):
+                            logger.debug("添加新引用并递归处理: %s", full_ref_path)
                             self.referenced_usd_files.add(full_ref_path)
-                            # 添加到references列表
-                            self.references.append((ref, "reference"))
                             # 递归处理引用的USD文件
-                            self.extract_assets_from_usd(full_ref_path, effective_dir)
+                            yield full_ref_path, effective_dir
             
             # 2. 如果是USDA文件，直接从文件内容中提取@符号之间的内容
             if file_ext == '.usda':
                 try:
-                    with open(abs_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = f.read()
-                        
-                    # 提取所有@符号之间的内容
-                    pattern = r'@([^@]+)@'
-                    matches = re.findall(pattern, content)
-                    logger.info(f"从{abs_path}中找到 {len(matches)} 个@符号之间的内容")
+                    # 提取所有@符号之间的内容（优先使用文本引用扫描时已提取的结果，避免再次读取文件）
+                    matches = self._at_token_cache.pop(abs_path, None)
+                    if matches is None:
+                        with _open_text_bytes(abs_path) as content:
+                            matches = [path.decode('utf-8', 'ignore') for _, path in _iter_at_tokens(content)]
+                    logger.debug("从%s中找到 %s 个@符号之间的内容", abs_path, len(matches))
                     
+                    # 重复的内容不会再添加贴图或引用，按出现顺序去重后只分类一次
+                    matches = list(dict.fromkeys(matches))
+                    self._prefetch_at_references(matches, effective_dir)
                     for path in matches:
-                        logger.info(f"@符号之间的内容: {path}")
-                        # 检查是否是贴图路径
-                        if '.' in path and any(ext in path.lower() for ext in ['.jpg', '.jpeg', '.png', '.tif', '.tiff', '.exr', '.hdr']):
-                            # 解析路径
-                            resolved_path = self.resolve_path(path, effective_dir)
-                            if resolved_path:
-                                # 检查是否包含UDIM相关字符
-                                if any(pattern in path for pattern in ['<UDIM>', '<udim>', '.####.', '.1001.']):
-                                    self.add_texture_path(resolved_path, f"{current_usd_name}:UDIM")
-                                    logger.info(f"添加UDIM贴图: {resolved_path}")
-                                else:
-                                    self.add_texture_path(resolved_path, f"{current_usd_name}:texture")
-                                    logger.info(f"添加普通贴图: {resolved_path}")
-                        # 检查是否是USD文件引用
-                        elif '.usda' in path.lower() or '.usd' in path.lower() or '.usdz' in path.lower():
-                            # 解析路径
-                            resolved_path = self.resolve_path(path, effective_dir)
-                            if resolved_path:
-                                logger.info(f"从@符号中发现USD引用: {path} -> {resolved_path}")
-                                # 检查是否已经添加过这个引用
-                                ref_already_added = False
-                                for existing_ref, ref_type in self.references:
-                                    existing_full_path = self.resolve_path(existing_ref, effective_dir)
-                                    if existing_full_path and os.path.normpath(existing_full_path) == os.path.normpath(resolved_path):
-                                        ref_already_added = True
-                                        break
-                                
-                                if not ref_already_added:
-                                    # 添加到references列表
-                                    self.references.append((path, "reference"))
-                                    # 递归处理引用的USD文件
-                                    self.extract_assets_from_usd(resolved_path, effective_dir)
+                        ref_path = self._classify_at_path(path, effective_dir, current_usd_name)
+                        if ref_path:
+                            # 递归处理引用的USD文件
+                            yield ref_path, effective_dir
                 except Exception as e:
-                    logger.error(f"处理USDA文件内容时出错: {str(e)}")
+                    logger.error("处理USDA文件内容时出错: %s", str(e))
                     logger.error(traceback.format_exc())
             
             # 3. 使用USD API检查材质和着色器
             try:
                 stage = Usd.Stage.Open(abs_path)
                 if stage:
-                    logger.info(f"成功打开USD舞台: {abs_path}")
+                    logger.debug("成功打开USD舞台: %s", abs_path)
                     
                     # 检查subLayers
                     layer_stack = stage.GetLayerStack()
@@ -1507,18 +1294,20 @@ class EnhancedUsdAnalyzer:
                             # 尝试使用 identifier 属性
                             layer_path = layer.identifier
                             if layer_path != abs_path:  # 跳过当前文件
-                                logger.info(f"发现subLayer: {layer_path}")
+                                logger.debug("发现subLayer: %s", layer_path)
                                 self.referenced_usd_files.add(layer_path)
                                 # 添加到references列表
-                                self.references.append((layer_path, "subLayer"))
+                                self._add_reference(layer_path, "subLayer", effective_dir)
                                 # 递归处理subLayer
-                                self.extract_assets_from_usd(layer_path, effective_dir)
+                                yield layer_path, effective_dir
                         except Exception as e:
-                            logger.warning(f"获取层标识符失败: {str(e)}")
+                            logger.warning("获取层标识符失败: %s", str(e))
                     
                     # 遍历所有prim
-                    for prim in stage.Traverse():
-                        logger.info(f"处理Prim: {prim.GetPath()}, 类型: {prim.GetTypeName()}")
+                    for prim in Usd.PrimRange.Stage(stage, Usd.PrimDefaultPredicate):
+                        prim_path = prim.GetPath()
+                        type_name = prim.GetTypeName()
+                        logger.debug("处理Prim: %s, 类型: %s", prim_path, type_name)
                         
                         # 检查引用和payload
                         if prim.HasReferences():
@@ -1528,14 +1317,14 @@ class EnhancedUsdAnalyzer:
                                     ref = refs.GetReferencedLayer(i)
                                     if ref:
                                         ref_path = ref.identifier
-                                        logger.info(f"在Prim {prim.GetPath()} 上发现引用: {ref_path}")
+                                        logger.debug("在Prim %s 上发现引用: %s", prim_path, ref_path)
                                         self.referenced_usd_files.add(ref_path)
                                         # 添加到references列表
-                                        self.references.append((ref_path, "reference"))
+                                        self._add_reference(ref_path, "reference", effective_dir)
                                         # 递归处理引用
-                                        self.extract_assets_from_usd(ref_path, effective_dir)
+                                        yield ref_path, effective_dir
                                 except Exception as e:
-                                    logger.warning(f"处理引用失败: {str(e)}")
+                                    logger.warning("处理引用失败: %s", str(e))
                         
                         if prim.HasPayloads():
                             payloads = prim.GetPayloads()
@@ -1544,36 +1333,33 @@ class EnhancedUsdAnalyzer:
                                     payload = payloads.GetPayloadAt(i)
                                     if payload.GetAssetPath():
                                         payload_path = payload.GetAssetPath()
-                                        logger.info(f"在Prim {prim.GetPath()} 上发现payload: {payload_path}")
+                                        logger.debug("在Prim %s 上发现payload: %s", prim_path, payload_path)
                                         self.referenced_usd_files.add(payload_path)
                                         # 添加到references列表
-                                        self.references.append((payload_path, "payload"))
+                                        self._add_reference(payload_path, "payload", effective_dir)
                                         # 递归处理payload
                                         resolved_payload_path = self.resolve_path(payload_path, effective_dir)
                                         if resolved_payload_path:
-                                            self.extract_assets_from_usd(resolved_payload_path, effective_dir)
+                                            yield resolved_payload_path, effective_dir
                                 except Exception as e:
-                                    logger.warning(f"处理payload失败: {str(e)}")
+                                    logger.warning("处理payload失败: %s", str(e))
                         
-                        # 检查材质
-                        if UsdShade.Material(prim):
+                        # 检查材质（先按类型名过滤，只为材质prim构造UsdShade.Material）
+                        if type_name in MATERIAL_PRIM_TYPES:
                             material = UsdShade.Material(prim)
-                            logger.info(f"发现材质: {prim.GetPath()}")
+                            logger.debug("发现材质: %s", prim_path)
                             self.collect_textures_from_material(material, effective_dir)
                         
                         # 检查着色器
-                        elif UsdShade.Shader(prim):
-                            shader = UsdShade.Shader(prim)
-                            shader_name = prim.GetName()
-                            
-                            logger.info(f"发现着色器: {prim.GetPath()}")
+                        elif type_name in SHADER_PRIM_TYPES:
+                            logger.debug("发现着色器: %s", prim_path)
                             self.examine_material_or_shader(prim, effective_dir)
             except Exception as e:
-                logger.error(f"使用USD API处理文件时出错: {str(e)}")
+                logger.error("使用USD API处理文件时出错: %s", str(e))
                 logger.error(traceback.format_exc())
 
         except Exception as e:
-            logger.error(f"处理USD文件时出错: {str(e)}")
+            logger.error("处理USD文件时出错: %s", str(e))
             logger.error(traceback.format_exc())
 
     def count_actual_textures(self, base_path):
@@ -1583,19 +1369,19 @@ class EnhancedUsdAnalyzer:
             
         # 将路径标准化但保持原始大小写
         path = base_path.replace('\\', '/')
-        logger.info(f"开始计算贴图数量，路径: {path}")
+        logger.debug("开始计算贴图数量，路径: %s", path)
         
         # 提取基础目录
         dir_path = os.path.dirname(path)
         file_name = os.path.basename(path)
         
         # 检查目录是否存在
-        if not os.path.exists(dir_path):
-            logger.warning(f"贴图目录不存在: {dir_path}")
+        if not self._exists(dir_path):
+            logger.warning("贴图目录不存在: %s", dir_path)
             return 0
         
         # 检查是否是 UDIM 贴图
-        is_udim = any(pattern in path for pattern in ['<UDIM>', '<udim>', '.####.', '.<udim>.', '.<UDIM>.'])
+        is_udim = any(marker in path for marker in UDIM_MARKERS)
         
         # 如果是 UDIM 贴图，提取基础名称
         if is_udim:
@@ -1612,53 +1398,45 @@ class EnhancedUsdAnalyzer:
                         break
             
             if base_name and extension:
-                logger.info(f"UDIM 贴图基础名称: {base_name}, 扩展名: {extension}")
+                logger.debug("UDIM 贴图基础名称: %s, 扩展名: %s", base_name, extension)
                 
-                # 尝试多种模式来匹配 UDIM 贴图
-                patterns = [
-                    # 标准 UDIM 格式: base.1001.ext, base.1002.ext 等
-                    re.compile(f"^{re.escape(base_name)}\\.(\\d{{4}})\\.{re.escape(extension)}$"),
-                    # 简单数字格式: base.1.ext, base.2.ext 等
-                    re.compile(f"^{re.escape(base_name)}\\.(\\d+)\\.{re.escape(extension)}$"),
-                    # 其他可能的格式
-                    re.compile(f"^{re.escape(base_name)}.*\\.{re.escape(extension)}$")
-                ]
+                # 匹配 UDIM 贴图：标准 UDIM 格式 base.1001.ext、简单数字格式 base.1.ext 以及其他 base*.ext 格式，
+                # 前两种都包含在最后一种之内，因此只需判断文件名的开头和结尾
+                suffix = '.' + extension
+                min_length = len(base_name) + len(suffix)
                 
                 # 计算匹配的文件数量
                 count = 0
                 matched_files = []
                 
-                for file in os.listdir(dir_path):
-                    for pattern in patterns:
-                        if pattern.match(file):
-                            count += 1
-                            matched_files.append(file)
-                            logger.info(f"找到 UDIM 贴图: {os.path.join(dir_path, file)}")
-                            break
+                for file in self._listdir(dir_path):
+                    if len(file) >= min_length and file.startswith(base_name) and file.endswith(suffix):
+                        count += 1
+                        matched_files.append(file)
+                        logger.debug("找到 UDIM 贴图: %s", os.path.join(dir_path, file))
                 
                 if count > 0:
-                    logger.info(f"目录 {dir_path} 中共有 {count} 个 UDIM 贴图: {matched_files}")
+                    logger.debug("目录 %s 中共有 %s 个 UDIM 贴图: %s", dir_path, count, matched_files)
                     return count
                 else:
-                    logger.warning(f"未找到匹配的 UDIM 贴图，将计算目录中所有贴图的数量")
+                    logger.warning("未找到匹配的 UDIM 贴图，将计算目录中所有贴图的数量")
         
         # 如果不是 UDIM 贴图或者没有找到匹配的 UDIM 贴图，计算所有贴图的数量
         try:
             count = 0
             matched_files = []
             
-            for file in os.listdir(dir_path):
+            for file in self._listdir(dir_path):
                 # 检查文件是否是图像文件
-                ext = os.path.splitext(file)[1].lower()
-                if ext in ['.jpg', '.jpeg', '.png', '.tif', '.tiff', '.exr', '.hdr', '.tx', '.tex']:
+                if file.lower().endswith(COUNTED_TEXTURE_EXTENSIONS):
                     count += 1
                     matched_files.append(file)
-                    logger.info(f"找到贴图: {os.path.join(dir_path, file)}")
+                    logger.debug("找到贴图: %s", os.path.join(dir_path, file))
             
-            logger.info(f"目录 {dir_path} 中共有 {count} 个贴图: {matched_files}")
+            logger.debug("目录 %s 中共有 %s 个贴图: %s", dir_path, count, matched_files)
             return count
         except Exception as e:
-            logger.error(f"计算实际贴图数量时出错: {str(e)}")
+            logger.error("计算实际贴图数量时出错: %s", str(e))
             logger.error(traceback.format_exc())
             return 0
 
@@ -1677,15 +1455,15 @@ class EnhancedUsdAnalyzer:
             
         # 标准化路径
         path = udim_path.replace('\\', '/')
-        logger.info(f"解析 UDIM 贴图路径: {path}")
+        logger.debug("解析 UDIM 贴图路径: %s", path)
         
         # 提取目录和文件名
         dir_path = os.path.dirname(path)
         file_name = os.path.basename(path)
         
         # 检查目录是否存在
-        if not os.path.exists(dir_path):
-            logger.warning(f"UDIM 贴图目录不存在: {dir_path}")
+        if not self._exists(dir_path):
+            logger.warning("UDIM 贴图目录不存在: %s", dir_path)
             return 0
             
         # 检查是否是 UDIM 贴图路径
@@ -1693,13 +1471,12 @@ class EnhancedUsdAnalyzer:
         is_udim = any(pattern in file_name for pattern in udim_patterns)
         
         if not is_udim:
-            logger.warning(f"不是 UDIM 贴图路径: {path}")
+            logger.warning("不是 UDIM 贴图路径: %s", path)
             return 0
             
         # 提取基础名称和扩展名
         base_name = None
         extension = None
-        pattern_found = None
         
         for pattern in udim_patterns:
             if pattern in file_name:
@@ -1707,47 +1484,34 @@ class EnhancedUsdAnalyzer:
                 if len(parts) >= 2:
                     base_name = parts[0]
                     extension = parts[1]
-                    pattern_found = pattern
                     break
         
         if not base_name or not extension:
-            logger.warning(f"无法从 UDIM 贴图路径提取基础名称和扩展名: {path}")
+            logger.warning("无法从 UDIM 贴图路径提取基础名称和扩展名: %s", path)
             return 0
             
-        logger.info(f"UDIM 贴图基础名称: {base_name}, 扩展名: {extension}")
-        
-        # 构建正则表达式模式
-        patterns = []
+        logger.debug("UDIM 贴图基础名称: %s, 扩展名: %s", base_name, extension)
         
-        # 根据找到的模式类型构建不同的正则表达式
-        if pattern_found in ['<UDIM>', '<udim>']:
-            # 对于 <UDIM> 或 <udim> 格式，查找 base.1001.ext, base.1002.ext 等
-            patterns.append(re.compile(f"^{re.escape(base_name)}(\d{{4}}){re.escape(extension)}$"))
-        elif pattern_found in ['.####.', '.<udim>.', '.<UDIM>.']:
-            # 对于 .####. 或 .<udim>. 或 .<UDIM>. 格式，查找 base.1001.ext, base.1002.ext 等
-            patterns.append(re.compile(f"^{re.escape(base_name)}\.(\d{{4}})\.{re.escape(extension)}$"))
-        
-        # 添加简单数字格式作为备选
-        patterns.append(re.compile(f"^{re.escape(base_name)}\.(\d+)\.{re.escape(extension)}$"))
-        patterns.append(re.compile(f"^{re.escape(base_name)}(\d+){re.escape(extension)}$"))
+        # 构建正则表达式模式：base1001ext（<UDIM>/<udim> 格式）和 base.1001.ext（.####./.<udim>./.<UDIM>. 格式）
+        # 分别包含在简单数字格式 base数字ext 和 base.数字.ext 之中，合并为一个正则只匹配一次
+        pattern = re.compile(rf"^{re.escape(base_name)}(?:\.\d+\.|\d+){re.escape(extension)}$")
         
         # 查找匹配的文件
         matched_files = []
         
         try:
-            for file in os.listdir(dir_path):
-                for pattern in patterns:
-                    if pattern.match(file):
-                        matched_files.append(file)
-                        logger.info(f"找到匹配的 UDIM 贴图: {os.path.join(dir_path, file)}")
-                        break
+            for file in self._listdir(dir_path):
+                # 先用开头和结尾筛掉大部分无关文件，只对可能匹配的文件名运行正则
+                if file.startswith(base_name) and file.endswith(extension) and pattern.match(file):
+                    matched_files.append(file)
+                    logger.debug("找到匹配的 UDIM 贴图: %s", os.path.join(dir_path, file))
         except Exception as e:
-            logger.error(f"查找 UDIM 贴图时出错: {str(e)}")
+            logger.error("查找 UDIM 贴图时出错: %s", str(e))
             logger.error(traceback.format_exc())
             return 0
             
         count = len(matched_files)
-        logger.info(f"UDIM 贴图 {path} 共找到 {count} 个实际文件: {matched_files}")
+        logger.debug("UDIM 贴图 %s 共找到 %s 个实际文件: %s", path, count, matched_files)
         
         # 如果没有找到匹配文件但路径中包含 UDIM 占位符，尝试直接检查文件是否存在
         if count == 0 and is_udim:
@@ -1763,10 +1527,9 @@ class EnhancedUsdAnalyzer:
                     # 对于 base.####.ext 或 base.<udim>.ext 或 base.<UDIM>.ext 格式
                     wildcard_path = wildcard_path.replace(pattern_format, '.*.')
             
-            import glob
-            matched_glob_files = glob.glob(wildcard_path)
+            matched_glob_files = self._glob(wildcard_path)
             count = len(matched_glob_files)
-            logger.info(f"使用通配符 {wildcard_path} 找到 {count} 个文件: {matched_glob_files}")
+            logger.debug("使用通配符 %s 找到 %s 个文件: %s", wildcard_path, count, matched_glob_files)
         
         return count
 
@@ -1775,21 +1538,6 @@ class EnhancedUsdAnalyzer:
         try:
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
                 content = f.read()
-                
-            file_patterns = [
-                r'file\s*=\s*"([^"]+)"',  # file = "path/to/texture.jpg"
-                r'sourceColorFile\s*=\s*"([^"]+)"',  # sourceColorFile = "path/to/texture.jpg"
-                r'colorFile\s*=\s*"([^"]+)"',  # colorFile = "path/to/texture.jpg"
-                r'texture:file\s*=\s*"([^"]+)"',  # texture:file = "path/to/texture.jpg"
-                r'assetInfo:file\s*=\s*"([^"]+)"',  # assetInfo:file = "path/to/texture.jpg"
-                r'inputs:file\s*=\s*"([^"]+)"',  # inputs:file = "path/to/texture.jpg"
-                r'inputs:filename\s*=\s*"([^"]+)"',  # inputs:filename = "path/to/texture.jpg"
-                r'asset inputs:file\s*=\s*@([^@]+)@',  # asset inputs:file = @path/to/texture.jpg@
-                r'asset inputs:filename\s*=\s*@([^@]+)@',  # asset inputs:filename = @path/to/texture.jpg@
-                r'asset inputs:[a-zA-Z0-9_]+_texture\s*=\s*@([^@]+)@',  # asset inputs:basecolor_texture = @path/to/texture.jpg@
-                r'string inputs:file\s*=\s*"([^"]+)"',  # string inputs:file = "path/to/texture.jpg"
-                r'string inputs:filename\s*=\s*"([^"]+)"',  # string inputs:filename = "path/to/texture.jpg"
-            ]
 
             base_dir = os.path.dirname(file_path)
             
@@ -1797,11 +1545,6 @@ class EnhancedUsdAnalyzer:
             if source_name is None:
                 source_name = os.path.basename(file_path)
             
-            # 尝试从文件内容中提取prim名称
-            prim_pattern = r'def\s+"([^"]+)"\s*\('
-            prim_matches = re.findall(prim_pattern, content)
-            current_prim = None
-            
             # 分析文件内容，按行处理
             lines = content.split('\n')
             current_prim = None
@@ -1813,8 +1556,11 @@ class EnhancedUsdAnalyzer:
             current_shader = None
             
             for line in lines:
+                # prim、材质和着色器定义都以def开头，不含def的行不必匹配
+                has_def = 'def' in line
+                
                 # 检查是否开始一个新的prim定义
-                prim_match = re.search(r'def\s+"?([^"\s]+)"?\s*\(', line)
+                prim_match = has_def and PRIM_DEF_RE.search(line)
                 if prim_match:
                     current_prim = prim_match.group(1)
                     in_prim_block = True
@@ -1825,17 +1571,17 @@ class EnhancedUsdAnalyzer:
                     continue
                 
                 # 检查是否定义了材质
-                material_match = re.search(r'def\s+Material\s+"?([^"\s]+)"?\s*\(', line)
+                material_match = has_def and MATERIAL_DEF_RE.search(line)
                 if material_match:
                     current_material = material_match.group(1)
-                    logger.info(f"发现材质定义: {current_material}")
+                    logger.debug("发现材质定义: %s", current_material)
                     continue
                 
                 # 检查是否定义了着色器
-                shader_match = re.search(r'def\s+Shader\s+"?([^"\s]+)"?\s*\(', line)
+                shader_match = has_def and SHADER_DEF_RE.search(line)
                 if shader_match:
                     current_shader = shader_match.group(1)
-                    logger.info(f"发现着色器定义: {current_shader}")
+                    logger.debug("发现着色器定义: %s", current_shader)
                     continue
                 
                 # 跟踪花括号以确定prim块的范围
@@ -1852,28 +1598,19 @@ class EnhancedUsdAnalyzer:
                     if not context:
                         context = current_prim
                     
-                    # 查找贴图路径
-                    for pattern in file_patterns:
-                        matches = re.findall(pattern, line)
-                        for match in matches:
-                            if self.is_likely_texture_path(match):
-                                resolved_path = self.resolve_path(match, base_dir)
-                                if resolved_path:
-                                    # 使用当前上下文作为贴图来源
-                                    logger.info(f"在 '{context}' 中发现贴图: {resolved_path}")
-                                    self.add_texture_path(resolved_path, f"{source_name}:{context}")
+                    # 所有贴图定义模式都包含=，不含=的行直接跳过
+                    if '=' not in line:
+                        continue
                     
-                    # 特别处理asset inputs:*_texture类型的属性
-                    asset_texture_match = re.search(r'asset\s+inputs:([a-zA-Z0-9_]+)_texture\s*=\s*@([^@]+)@', line)
-                    if asset_texture_match:
-                        input_name = asset_texture_match.group(1)
-                        texture_path = asset_texture_match.group(2)
-                        if self.is_likely_texture_path(texture_path):
-                            resolved_path = self.resolve_path(texture_path, base_dir)
+                    # 查找贴图路径
+                    for match in _iter_file_texture_paths(line):
+                        if self.is_likely_texture_path(match):
+                            resolved_path = self.resolve_path(match, base_dir)
                             if resolved_path:
-                                logger.info(f"在 '{context}' 中发现 {input_name} 贴图: {resolved_path}")
-                                self.add_texture_path(resolved_path, f"{source_name}:{context}:{input_name}")
+                                # 使用当前上下文作为贴图来源
+                                logger.debug("在 '%s' 中发现贴图: %s", context, resolved_path)
+                                self.add_texture_path(resolved_path, f"{source_name}:{context}")
 
         except Exception as e:
-            logger.error(f"扫描文件 {file_path} 失败: {str(e)}")
+            logger.error("扫描文件 %s 失败: %s", file_path, str(e))
             logger.error(traceback.format_exc())